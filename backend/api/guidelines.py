@@ -66,7 +66,7 @@ def convert_guideline_to_response(guideline: ClinicalGuideline, detailed: bool =
         return DetailedGuidelineResponse(
             **base_response.dict(),
             content=guideline.content,
-            key_recommendations=guideline.key_recommendations,
+            key_recommendations=[rec.as_dict() for rec in guideline.key_recommendations],
             contraindications=guideline.contraindications,
             monitoring_requirements=guideline.monitoring_requirements,
             patient_populations=guideline.patient_populations,
@@ -250,7 +250,7 @@ async def get_guideline_recommendations(guideline_id: str):
             "organization": guideline.organization,
             "publication_year": guideline.publication_year,
             "evidence_level": guideline.evidence_level,
-            "key_recommendations": guideline.key_recommendations,
+            "key_recommendations": [rec.as_dict() for rec in guideline.key_recommendations],
             "total_recommendations": len(guideline.key_recommendations)
         }
         
@@ -299,11 +299,11 @@ async def get_specialty_clinical_alerts(specialty: str):
             
             # Create alerts for Class I recommendations
             for rec in guideline.key_recommendations:
-                if rec.get("class") == "I" or rec.get("class") == "Strong":
+                if rec.cls == "I" or rec.cls == "Strong":
                     alerts.append({
                         "alert_type": "STRONG_RECOMMENDATION",
-                        "recommendation": rec["recommendation"],
-                        "evidence_level": rec.get("level_of_evidence", "Unknown"),
+                        "recommendation": rec.recommendation,
+                        "evidence_level": rec.level_of_evidence,
                         "source_guideline": guideline.title
                     })
         
@@ -373,9 +373,9 @@ async def compare_guidelines(guideline_ids: List[str]):
                 comparison["recommendation_comparison"].append({
                     "guideline_index": i,
                     "guideline_title": guideline.title,
-                    "recommendation": rec["recommendation"],
-                    "class": rec.get("class", "Unknown"),
-                    "evidence_level": rec.get("level_of_evidence", "Unknown")
+                    "recommendation": rec.recommendation,
+                    "class": rec.cls,
+                    "evidence_level": rec.level_of_evidence
                 })
         
         # Find overlapping contraindications
@@ -487,7 +487,7 @@ class EnhancedClinicalAIService(ClinicalAIService):
                 "organization": g.organization,
                 "year": g.publication_year,
                 "evidence_level": g.evidence_level,
-                "key_recommendations": g.key_recommendations[:3],  # Top 3 recommendations
+                "key_recommendations": [rec.as_dict() for rec in g.key_recommendations[:3]],  # Top 3 recommendations
                 "contraindications": g.contraindications,
                 "monitoring": g.monitoring_requirements
             }
@@ -1,7 +1,7 @@
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from typing import List, Dict, Any
-import json
+import orjson
 import os
 from services.knowledge_processor import KnowledgeProcessor
 from services.rag_service import RAGService
@@ -48,8 +48,8 @@ async def get_knowledge_base_stats():
         metadata = {}
         
         if os.path.exists(metadata_path):
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+            with open(metadata_path, 'rb') as f:
+                metadata = orjson.loads(f.read())
         
         return {
             "index_stats": index_stats,
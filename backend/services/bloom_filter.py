@@ -0,0 +1,69 @@
+# backend/services/bloom_filter.py
+import os
+import math
+import struct
+import hashlib
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, persisted as a flat bit array.
+
+    Membership checks can return false positives (at roughly ``error_rate``)
+    but never false negatives.
+    """
+
+    _HEADER = struct.Struct("<QQQ")  # capacity, bit count, hash count
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-4):
+        self.capacity = capacity
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing: derive all probe positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(self.capacity, self.num_bits, self.num_hashes))
+            f.write(self.bits)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BloomFilter"]:
+        """Load a filter saved with ``save``, or return None if there is none"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                capacity, num_bits, num_hashes = cls._HEADER.unpack(f.read(cls._HEADER.size))
+                bits = bytearray(f.read())
+            if len(bits) != (num_bits + 7) // 8:
+                raise ValueError("truncated bit array")
+        except Exception as e:
+            logger.warning(f"Could not load Bloom filter from {path}: {e}")
+            return None
+
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bits
+        return bloom
@@ -62,31 +62,32 @@ class ClinicalAIService:
         context_parts = []
         
         # Add patient context if available
-        if query.patient_context:
+        patient_context = query.patient_context
+        if patient_context:
             patient_info = []
-            if query.patient_context.age:
-                patient_info.append(f"Age: {query.patient_context.age}")
-            if query.patient_context.gender:
-                patient_info.append(f"Gender: {query.patient_context.gender}")
-            if query.patient_context.medical_conditions:
-                patient_info.append(f"Conditions: {', '.join(query.patient_context.medical_conditions)}")
-            if query.patient_context.current_medications:
-                patient_info.append(f"Medications: {', '.join(query.patient_context.current_medications)}")
+            if patient_context.age:
+                patient_info.append(f"Age: {patient_context.age}")
+            if patient_context.gender:
+                patient_info.append(f"Gender: {patient_context.gender}")
+            if patient_context.medical_conditions:
+                patient_info.append("Conditions: " + ", ".join(patient_context.medical_conditions))
+            if patient_context.current_medications:
+                patient_info.append("Medications: " + ", ".join(patient_context.current_medications))
             
             if patient_info:
-                context_parts.append(f"PATIENT CONTEXT: {'; '.join(patient_info)}")
+                context_parts.append("PATIENT CONTEXT: " + "; ".join(patient_info))
         
-        # Add relevant medical literature
+        # Add relevant medical literature as one pre-sized block
         if docs:
-            context_parts.append("RELEVANT MEDICAL KNOWLEDGE:")
+            lines = ["RELEVANT MEDICAL KNOWLEDGE:"]
+            append = lines.append
             for i, doc in enumerate(docs, 1):
-                source_info = doc['metadata'].get('source_file', 'Unknown source')
-                evidence_level = doc['metadata'].get('evidence_level', 'Unknown')
-                context_parts.append(
-                    f"\n{i}. Source: {source_info} (Evidence Level: {evidence_level})\n"
-                    f"   Content: {doc['content']}\n"
-                    f"   Relevance Score: {doc['score']:.3f}"
-                )
+                metadata = doc['metadata']
+                append(f"\n\n{i}. Source: {metadata.get('source_file', 'Unknown source')} "
+                       f"(Evidence Level: {metadata.get('evidence_level', 'Unknown')})")
+                append(f"   Content: {doc['content']}")
+                append(f"   Relevance Score: {doc['score']:.3f}")
+            context_parts.append("\n".join(lines))
         
         return "\n\n".join(context_parts)
     
@@ -0,0 +1,71 @@
+# backend/services/content_store.py
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class ContentStore:
+    """SQLite store of document chunk text keyed by vector id.
+
+    Keeps chunk text out of Pinecone metadata so upserts and query responses
+    carry only vectors and small fields; retrieval joins the text back in
+    with one batched lookup.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("CONTENT_STORE_PATH", "data/store/content.sqlite3")
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents (doc_id TEXT PRIMARY KEY, content TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """Short fingerprint stored in metadata in place of the text"""
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
+    def put_many(self, doc_ids: List[str], contents: List[str]):
+        if not doc_ids:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO documents (doc_id, content) VALUES (?, ?)",
+                zip(doc_ids, contents)
+            )
+            self._conn.commit()
+
+    def get_many(self, doc_ids: Iterable[str]) -> Dict[str, str]:
+        """Return stored content for the given ids, keyed by id"""
+        id_list = list(doc_ids)
+        found = {}
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(id_list), 500):
+                batch = id_list[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT doc_id, content FROM documents WHERE doc_id IN ({placeholders})", batch
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def delete_many(self, doc_ids: List[str]):
+        with self._lock:
+            self._conn.executemany("DELETE FROM documents WHERE doc_id = ?", ((doc_id,) for doc_id in doc_ids))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
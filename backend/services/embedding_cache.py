@@ -0,0 +1,118 @@
+# backend/services/embedding_cache.py
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Iterable, Union
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """Content-addressed cache of embedding vectors persisted in SQLite.
+
+    Vectors are stored as raw float16 BLOBs keyed by a hash of the embedded
+    text and the embedding model, so re-running an ingest only pays for
+    chunks that were never embedded before. The most recently used vectors
+    are also kept in memory so repeated queries skip the database too.
+    Half precision halves storage and reads; the rounding error (~1e-3
+    relative) is far below what changes a cosine ranking.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        model: str = "text-embedding-ada-002",
+        memory_size: int = 10_000
+    ):
+        self.path = path or os.getenv("EMBEDDING_CACHE_PATH", "data/cache/embeddings.sqlite3")
+        self.model = model
+        self._key_prefix = hashlib.blake2b(model.encode() + b"\0", digest_size=20)
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        # Caches created before vectors were stored as float16 hold float32 rows
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+        if "dtype" not in columns:
+            self._conn.execute("ALTER TABLE embeddings ADD COLUMN dtype TEXT NOT NULL DEFAULT 'float32'")
+        self._conn.commit()
+
+    def key_for(self, text: str) -> str:
+        """Hash text together with the model name"""
+        # Resume from the pre-hashed model prefix instead of re-hashing it per text
+        digest = self._key_prefix.copy()
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return cached embeddings for the given texts as float32 arrays, keyed by text"""
+        keys = {}
+        for text in texts:
+            keys[self.key_for(text)] = text
+
+        found = {}
+        if not keys:
+            return found
+
+        with self._lock:
+            key_list = []
+            for key, text in keys.items():
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[text] = vector.astype(np.float32)
+                else:
+                    key_list.append(key)
+
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(key_list), 500):
+                batch = key_list[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector, dtype FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob, dtype in rows:
+                    vector = np.frombuffer(blob, dtype=dtype).astype(np.float16)
+                    found[keys[key]] = vector.astype(np.float32)
+                    self._remember(key, vector)
+
+        return found
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Add to the in-memory tier, evicting the least recently used entries"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def put_many(self, texts: List[str], embeddings: Union[np.ndarray, List[List[float]]]):
+        """Persist embeddings for the given texts"""
+        keys = [self.key_for(text) for text in texts]
+        vectors = [np.asarray(embedding, dtype=np.float16) for embedding in embeddings]
+        rows = [(key, vector.tobytes(), "float16") for key, vector in zip(keys, vectors)]
+        if not rows:
+            return
+
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._remember(key, vector)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, dtype) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
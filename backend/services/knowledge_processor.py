@@ -1,20 +1,73 @@
 
 import os
+import asyncio
 import hashlib
 import logging
-import json
-from typing import List, Dict, Any
+import orjson
+from typing import List, Dict, Any, Tuple
+from bisect import bisect_right
+from functools import lru_cache
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
 import PyPDF2
 from docx import Document as DocxDocument
 from bs4 import BeautifulSoup
 import re
-from services.rag_service import RAGService, Document
+from services.rag_service import RAGService, Document, DocumentBatch
+from services.bloom_filter import BloomFilter
+from services.literature_collector import MedicalKnowledgeExpander
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'[.!?]\s+[A-Z]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+PAGE_MARKER_PATTERN = re.compile(r'--- Page \d+ ---')
+
+HIGH_EVIDENCE_TYPES = (
+    "Meta-Analysis",
+    "Systematic Review", 
+    "Practice Guideline",
+    "Randomized Controlled Trial"
+)
+
+MODERATE_EVIDENCE_TYPES = (
+    "Clinical Trial",
+    "Controlled Clinical Trial",
+    "Multicenter Study"
+)
+
+SPECIALTY_KEYWORDS = {
+    "cardiology": ("heart", "cardiac", "cardiovascular", "coronary", "myocardial"),
+    "endocrinology": ("diabetes", "insulin", "thyroid", "hormone", "endocrine"),
+    "infectious_disease": ("infection", "antibiotic", "bacteria", "virus", "sepsis"),
+    "pulmonology": ("lung", "respiratory", "pneumonia", "asthma", "COPD"),
+    "emergency_medicine": ("emergency", "trauma", "resuscitation", "acute"),
+    "neurology": ("brain", "neurologic", "stroke", "seizure", "nervous system")
+}
+
+@lru_cache(maxsize=128)
+def _evidence_level_for_article_type(article_type: str) -> str:
+    """Map a PubMed publication type to an evidence level (memoized)"""
+    if any(etype in article_type for etype in HIGH_EVIDENCE_TYPES):
+        return "A"
+    elif any(etype in article_type for etype in MODERATE_EVIDENCE_TYPES):
+        return "B"
+    else:
+        return "C"
+
+@lru_cache(maxsize=4096)
+def _specialty_for_mesh_terms(mesh_terms: Tuple[str, ...]) -> str:
+    """Map a set of MeSH terms to a medical specialty (memoized)"""
+    mesh_text = " ".join(mesh_terms).lower()
+    
+    for specialty, keywords in SPECIALTY_KEYWORDS.items():
+        if any(keyword in mesh_text for keyword in keywords):
+            return specialty
+    
+    return "general_medicine"
+
+@dataclass(slots=True)
 class MedicalArticle:
     """Data class for medical articles from PubMed"""
     pmid: str
@@ -35,11 +88,142 @@ class MedicalArticle:
         if self.keywords is None:
             self.keywords = []
 
+class _StreamingChunker:
+    """Incrementally chunk a document that arrives in pieces (e.g. PDF pages).
+
+    Produces exactly the chunks ``KnowledgeProcessor._chunk_text`` would for
+    the concatenated text, while only buffering the unchunked tail.
+    """
+    
+    def __init__(self, processor: "KnowledgeProcessor", base_metadata: Dict[str, Any]):
+        self.processor = processor
+        self.base_metadata = base_metadata
+        self.buffer = ""
+        self.offset = 0  # Position of buffer[0] in the cleaned document
+        self.start = 0   # Start of the next chunk in the cleaned document
+        self.chunk_num = 0
+        self.started = False
+        self.ends_with_space = False
+    
+    def feed(self, piece: str) -> List[Document]:
+        """Add raw text and return the chunks that are now complete"""
+        # Collapse whitespace across the piece boundary the same way
+        # _clean_text would on the concatenated text
+        piece = WHITESPACE_PATTERN.sub(' ', piece)
+        if self.ends_with_space and piece.startswith(' '):
+            piece = piece[1:]
+        if piece:
+            self.ends_with_space = piece.endswith(' ')
+        
+        piece = PAGE_MARKER_PATTERN.sub('', piece)
+        if not self.started:
+            piece = piece.lstrip()
+            self.started = bool(piece)
+        
+        self.buffer += piece
+        return self._drain(final=False)
+    
+    def flush(self) -> List[Document]:
+        """Return the remaining chunks once all pieces have been fed"""
+        self.buffer = self.buffer.rstrip()
+        return self._drain(final=True)
+    
+    def _drain(self, final: bool) -> List[Document]:
+        processor = self.processor
+        text = self.buffer
+        offset = self.offset
+        text_length = offset + len(text)
+        # Without the final piece, only cut chunks whose window is followed
+        # by content that stripping the document end cannot remove
+        known_length = text_length if final else offset + len(text.rstrip())
+        
+        match_starts, match_ends = processor._find_sentence_boundaries(text)
+        match_starts = [m + offset for m in match_starts]
+        match_ends = [m + offset for m in match_ends]
+        
+        chunks = []
+        start = self.start
+        
+        while start < text_length:
+            if not final and start + processor.chunk_size >= known_length:
+                break
+            
+            end = processor._next_chunk_end(start, text_length, match_starts, match_ends)
+            chunk_text = text[start - offset:end - offset].strip()
+            
+            if len(chunk_text) > 50:  # Only create chunks with meaningful content
+                chunks.append(processor._make_chunk(
+                    chunk_text, self.base_metadata, self.chunk_num, start, end
+                ))
+                self.chunk_num += 1
+            
+            # Move start position with overlap
+            start = end - processor.chunk_overlap
+            if start >= text_length:
+                break
+        
+        # Drop everything before the next chunk start
+        self.start = start
+        if start > offset:
+            self.buffer = text[start - offset:]
+            self.offset = start
+        
+        return chunks
+
 class KnowledgeProcessor:
     def __init__(self):
         self.rag_service = RAGService()
         self.chunk_size = 1000  # characters
         self.chunk_overlap = 200  # characters
+        self.ingested_filter_path = os.getenv("INGESTED_CHUNKS_FILTER_PATH", "data/cache/ingested_chunks.bloom")
+        self._ingested_filter = None
+        self._knowledge_expander = None
+    
+    def _get_knowledge_expander(self) -> MedicalKnowledgeExpander:
+        """Create the literature collectors once and reuse them across expansions"""
+        if self._knowledge_expander is None:
+            self._knowledge_expander = MedicalKnowledgeExpander()
+        return self._knowledge_expander
+    
+    def _get_ingested_filter(self) -> BloomFilter:
+        """Load the filter of already-ingested chunk texts only when needed"""
+        if self._ingested_filter is None:
+            self._ingested_filter = BloomFilter.load(self.ingested_filter_path) or BloomFilter()
+        return self._ingested_filter
+    
+    def _drop_ingested_chunks(self, documents: List[Document]) -> List[Document]:
+        """Skip chunks whose text was already ingested, here or in an earlier run"""
+        ingested = self._get_ingested_filter()
+        seen = set()
+        candidates = []  # (document, whether the filter reports its text as ingested)
+        
+        for doc in documents:
+            if doc.content in seen:
+                continue
+            seen.add(doc.content)
+            candidates.append((doc, doc.content in ingested))
+        
+        # Filter hits may be false positives, so only drop a chunk once its exact
+        # text is confirmed in the content store
+        stored = self.rag_service.get_stored_contents(doc.doc_id for doc, hit in candidates if hit)
+        unique = [doc for doc, hit in candidates if not hit or stored.get(doc.doc_id) != doc.content]
+        
+        unconfirmed = sum(hit for _, hit in candidates) - (len(candidates) - len(unique))
+        if unconfirmed:
+            logger.info(f"Kept {unconfirmed} chunks the ingested filter matched but the content store does not hold")
+        if len(unique) < len(documents):
+            logger.info(f"Skipped {len(documents) - len(unique)} duplicate chunks")
+        return unique
+    
+    def _record_ingested_chunks(self, texts: List[str]) -> None:
+        """Remember successfully ingested chunk texts across runs"""
+        ingested = self._get_ingested_filter()
+        for text in texts:
+            ingested.add(text)
+        try:
+            ingested.save(self.ingested_filter_path)
+        except OSError as e:
+            logger.warning(f"Could not save ingested chunk filter: {e}")
     
     def process_text_file(self, file_path: str, metadata: Dict[str, Any] = None) -> List[Document]:
         """Process a text file and return Document objects"""
@@ -64,25 +248,50 @@ class KnowledgeProcessor:
         try:
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                content = ""
                 
+                base_metadata = {
+                    "source_file": os.path.basename(file_path),
+                    "file_type": "pdf",
+                    "total_pages": len(pdf_reader.pages),
+                    **(metadata or {})
+                }
+                
+                # Feed pages one at a time so only a chunk-sized tail is buffered
+                chunker = _StreamingChunker(self, base_metadata)
+                documents = []
                 for page_num, page in enumerate(pdf_reader.pages):
                     page_text = page.extract_text()
-                    content += f"\n--- Page {page_num + 1} ---\n{page_text}"
-            
-            base_metadata = {
-                "source_file": os.path.basename(file_path),
-                "file_type": "pdf",
-                "total_pages": len(pdf_reader.pages),
-                **(metadata or {})
-            }
+                    documents.extend(chunker.feed(f"\n--- Page {page_num + 1} ---\n{page_text}"))
+                documents.extend(chunker.flush())
             
-            return self._chunk_text(content, base_metadata)
+            return documents
             
         except Exception as e:
             logger.error(f"Error processing PDF file {file_path}: {e}")
             return []
     
+    async def process_text_file_async(self, file_path: str, metadata: Dict[str, Any] = None) -> List[Document]:
+        """Process a text file without blocking the event loop"""
+        return await asyncio.to_thread(self.process_text_file, file_path, metadata)
+    
+    async def process_pdf_file_async(self, file_path: str, metadata: Dict[str, Any] = None) -> List[Document]:
+        """Process a PDF file without blocking the event loop"""
+        return await asyncio.to_thread(self.process_pdf_file, file_path, metadata)
+    
+    async def process_files_async(self, file_paths: List[str], metadata: Dict[str, Any] = None) -> List[Document]:
+        """Read and chunk many files concurrently, dispatching on file extension"""
+        tasks = []
+        for file_path in file_paths:
+            if file_path.lower().endswith('.pdf'):
+                tasks.append(self.process_pdf_file_async(file_path, metadata))
+            else:
+                tasks.append(self.process_text_file_async(file_path, metadata))
+        
+        documents = []
+        for file_documents in await asyncio.gather(*tasks):
+            documents.extend(file_documents)
+        return documents
+    
     def process_medical_guideline(self, content: str, guideline_info: Dict[str, Any]) -> List[Document]:
         """Process medical guideline content with specific metadata"""
         metadata = {
@@ -116,74 +325,100 @@ class KnowledgeProcessor:
         text = self._clean_text(text)
         
         chunks = []
-        start = 0
         chunk_num = 0
         
-        while start < len(text):
-            end = start + self.chunk_size
-            
-            # Try to break at sentence boundary
-            if end < len(text):
-                # Look for sentence endings within the last 200 characters
-                search_start = max(start + self.chunk_size - 200, start)
-                sentence_end = self._find_sentence_boundary(text, search_start, end)
-                if sentence_end != -1:
-                    end = sentence_end
-            
+        for start, end in self._compute_chunk_spans(text):
             chunk_text = text[start:end].strip()
             
             if len(chunk_text) > 50:  # Only create chunks with meaningful content
-                # Create unique ID for this chunk
-                chunk_id = self._generate_chunk_id(chunk_text, base_metadata, chunk_num)
-                
-                chunk_metadata = {
-                    **base_metadata,
-                    "chunk_number": chunk_num,
-                    "chunk_start": start,
-                    "chunk_end": end,
-                    "chunk_size": len(chunk_text)
-                }
-                
-                document = Document(
-                    content=chunk_text,
-                    metadata=chunk_metadata,
-                    doc_id=chunk_id
-                )
-                
-                chunks.append(document)
+                chunks.append(self._make_chunk(chunk_text, base_metadata, chunk_num, start, end))
                 chunk_num += 1
+        
+        return chunks
+    
+    def _make_chunk(
+        self,
+        chunk_text: str,
+        base_metadata: Dict[str, Any],
+        chunk_num: int,
+        start: int,
+        end: int
+    ) -> Document:
+        """Create the Document for a single chunk"""
+        # Create unique ID for this chunk
+        chunk_id = self._generate_chunk_id(chunk_text, base_metadata, chunk_num)
+        
+        chunk_metadata = {
+            **base_metadata,
+            "chunk_number": chunk_num,
+            "chunk_start": start,
+            "chunk_end": end,
+            "chunk_size": len(chunk_text)
+        }
+        
+        return Document(
+            content=chunk_text,
+            metadata=chunk_metadata,
+            doc_id=chunk_id
+        )
+    
+    def _compute_chunk_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Compute (start, end) offsets of overlapping chunks in a single pass"""
+        text_length = len(text)
+        match_starts, match_ends = self._find_sentence_boundaries(text)
+        
+        spans = []
+        start = 0
+        
+        while start < text_length:
+            end = self._next_chunk_end(start, text_length, match_starts, match_ends)
+            spans.append((start, end))
             
             # Move start position with overlap
             start = end - self.chunk_overlap
-            if start >= len(text):
+            if start >= text_length:
                 break
         
-        return chunks
+        return spans
+    
+    def _next_chunk_end(
+        self,
+        start: int,
+        text_length: int,
+        match_starts: List[int],
+        match_ends: List[int]
+    ) -> int:
+        """Pick the end offset of the chunk beginning at start"""
+        end = start + self.chunk_size
+        
+        # Try to break at sentence boundary
+        if end < text_length:
+            # Look for sentence endings within the last 200 characters:
+            # the last match ending inside the window must also start in it
+            search_start = max(start + self.chunk_size - 200, start)
+            last = bisect_right(match_ends, end) - 1
+            if last >= 0 and match_starts[last] >= search_start:
+                end = match_starts[last] + 1
+        
+        return end
     
     def _clean_text(self, text: str) -> str:
         """Clean text by removing extra whitespace and formatting"""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Remove extra whitespace (this also collapses newlines)
+        text = WHITESPACE_PATTERN.sub(' ', text)
         # Remove page headers/footers patterns
-        text = re.sub(r'--- Page \d+ ---', '', text)
-        # Remove multiple newlines
-        text = re.sub(r'\n+', '\n', text)
+        text = PAGE_MARKER_PATTERN.sub('', text)
         return text.strip()
     
-    def _find_sentence_boundary(self, text: str, start: int, end: int) -> int:
-        """Find a good sentence boundary for chunking"""
-        # Look for sentence endings (., !, ?) followed by space and capital letter
-        sentence_pattern = r'[.!?]\s+[A-Z]'
-        
-        search_text = text[start:end]
-        matches = list(re.finditer(sentence_pattern, search_text))
-        
-        if matches:
-            # Take the last sentence boundary found
-            last_match = matches[-1]
-            return start + last_match.start() + 1
-        
-        return -1
+    def _find_sentence_boundaries(self, text: str) -> Tuple[List[int], List[int]]:
+        """Find all sentence boundaries once, as parallel sorted start/end offsets"""
+        # Sentence endings (., !, ?) followed by space and capital letter
+        match_starts = []
+        match_ends = []
+        for match in SENTENCE_BOUNDARY_PATTERN.finditer(text):
+            match_starts.append(match.start())
+            match_ends.append(match.end())
+        return match_starts, match_ends
     
     def _generate_chunk_id(self, content: str, metadata: Dict[str, Any], chunk_num: int) -> str:
         """Generate unique ID for a chunk"""
@@ -290,10 +525,12 @@ class KnowledgeProcessor:
                 )
                 documents.extend(docs)
             
-            # Add documents to RAG service
+            # Add new documents to RAG service; it embeds them through its embedding cache
+            documents = self._drop_ingested_chunks(documents)
             success = self.rag_service.add_documents(documents)
             
             if success:
+                self._record_ingested_chunks([doc.content for doc in documents])
                 logger.info(f"Successfully loaded {len(documents)} sample medical documents")
                 return True
             else:
@@ -303,202 +540,184 @@ class KnowledgeProcessor:
         except Exception as e:
             logger.error(f"Error loading sample medical data: {e}")
             return False
-
-    # Add these methods to the existing KnowledgeProcessor class
-
-def process_pubmed_articles(self, articles: List[MedicalArticle]) -> List[Document]:
-    """Process PubMed articles into documents"""
-    documents = []
     
-    for article in articles:
-        # Combine title and abstract for full content
-        content = f"Title: {article.title}\n\nAbstract: {article.abstract}"
-        
-        # Add MeSH terms and keywords to content for better searchability
-        if article.mesh_terms:
-            content += f"\n\nMeSH Terms: {', '.join(article.mesh_terms)}"
-        
-        if article.keywords:
-            content += f"\n\nKeywords: {', '.join(article.keywords)}"
+    def process_pubmed_articles(self, articles: List[MedicalArticle]) -> List[Document]:
+        """Process PubMed articles into documents"""
+        documents = []
         
-        metadata = {
-            "document_type": "research_paper",
-            "pmid": article.pmid,
-            "title": article.title,
-            "journal": article.journal,
-            "authors": article.authors,
-            "publication_year": article.publication_date,
-            "doi": article.doi,
-            "article_type": article.article_type,
-            "mesh_terms": article.mesh_terms,
-            "keywords": article.keywords,
-            "url": article.url,
-            "evidence_level": self._determine_evidence_level(article.article_type),
-            "specialty": self._determine_specialty(article.mesh_terms)
-        }
+        for article in articles:
+            # Combine title and abstract for full content
+            sections = [f"Title: {article.title}", f"Abstract: {article.abstract}"]
+            
+            # Add MeSH terms and keywords to content for better searchability
+            if article.mesh_terms:
+                sections.append("MeSH Terms: " + ", ".join(article.mesh_terms))
+            
+            if article.keywords:
+                sections.append("Keywords: " + ", ".join(article.keywords))
+            
+            content = "\n\n".join(sections)
+            
+            metadata = {
+                "document_type": "research_paper",
+                "pmid": article.pmid,
+                "title": article.title,
+                "journal": article.journal,
+                "authors": article.authors,
+                "publication_year": article.publication_date,
+                "doi": article.doi,
+                "article_type": article.article_type,
+                "mesh_terms": list(article.mesh_terms),
+                "keywords": list(article.keywords),
+                "url": article.url,
+                "evidence_level": self._determine_evidence_level(article.article_type),
+                "specialty": self._determine_specialty(article.mesh_terms)
+            }
+            
+            # Create chunks from the content
+            chunks = self._chunk_text(content, metadata)
+            documents.extend(chunks)
         
-        # Create chunks from the content
-        chunks = self._chunk_text(content, metadata)
-        documents.extend(chunks)
-    
-    return documents
+        return documents
 
-def process_clinical_guidelines(self, guidelines: List[Dict[str, Any]]) -> List[Document]:
-    """Process clinical guidelines into documents"""
-    documents = []
-    
-    for guideline in guidelines:
-        # This would normally fetch the full guideline text
-        # For demo, we'll use the available information
-        content = f"Clinical Guideline: {guideline['title']}\n\n"
-        content += f"Organization: {guideline['organization']}\n"
-        content += f"Publication Year: {guideline['year']}\n"
-        content += f"Specialty: {guideline['specialty']}\n"
+    def process_clinical_guidelines(self, guidelines: List[Dict[str, Any]]) -> List[Document]:
+        """Process clinical guidelines into documents"""
+        documents = []
         
-        if 'topics' in guideline:
-            content += f"Key Topics: {', '.join(guideline['topics'])}\n\n"
-        
-        # In a real implementation, you would fetch the full guideline content here
-        content += "Full guideline content would be processed here..."
-        
-        metadata = {
-            "document_type": "clinical_guideline",
-            "title": guideline['title'],
-            "organization": guideline['organization'],
-            "publication_year": guideline['year'],
-            "specialty": guideline['specialty'],
-            "evidence_level": guideline.get('evidence_level', 'A'),
-            "url": guideline.get('url', ''),
-            "topics": guideline.get('topics', [])
-        }
+        for guideline in guidelines:
+            # This would normally fetch the full guideline text
+            # For demo, we'll use the available information
+            lines = [
+                f"Clinical Guideline: {guideline['title']}",
+                "",
+                f"Organization: {guideline['organization']}",
+                f"Publication Year: {guideline['year']}",
+                f"Specialty: {guideline['specialty']}"
+            ]
+            
+            if 'topics' in guideline:
+                lines.append("Key Topics: " + ", ".join(guideline['topics']))
+                lines.append("")
+            
+            # In a real implementation, you would fetch the full guideline content here
+            lines.append("Full guideline content would be processed here...")
+            content = "\n".join(lines)
+            
+            metadata = {
+                "document_type": "clinical_guideline",
+                "title": guideline['title'],
+                "organization": guideline['organization'],
+                "publication_year": guideline['year'],
+                "specialty": guideline['specialty'],
+                "evidence_level": guideline.get('evidence_level', 'A'),
+                "url": guideline.get('url', ''),
+                "topics": guideline.get('topics', [])
+            }
+            
+            chunks = self._chunk_text(content, metadata)
+            documents.extend(chunks)
         
-        chunks = self._chunk_text(content, metadata)
-        documents.extend(chunks)
-    
-    return documents
+        return documents
 
-def _determine_evidence_level(self, article_type: str) -> str:
-    """Determine evidence level based on article type"""
-    high_evidence_types = [
-        "Meta-Analysis",
-        "Systematic Review", 
-        "Practice Guideline",
-        "Randomized Controlled Trial"
-    ]
+    def _determine_evidence_level(self, article_type: str) -> str:
+        """Determine evidence level based on article type"""
+        return _evidence_level_for_article_type(article_type)
     
-    moderate_evidence_types = [
-        "Clinical Trial",
-        "Controlled Clinical Trial",
-        "Multicenter Study"
-    ]
-    
-    if any(etype in article_type for etype in high_evidence_types):
-        return "A"
-    elif any(etype in article_type for etype in moderate_evidence_types):
-        return "B"
-    else:
-        return "C"
-
-def _determine_specialty(self, mesh_terms: List[str]) -> str:
-    """Determine medical specialty from MeSH terms"""
-    specialty_keywords = {
-        "cardiology": ["heart", "cardiac", "cardiovascular", "coronary", "myocardial"],
-        "endocrinology": ["diabetes", "insulin", "thyroid", "hormone", "endocrine"],
-        "infectious_disease": ["infection", "antibiotic", "bacteria", "virus", "sepsis"],
-        "pulmonology": ["lung", "respiratory", "pneumonia", "asthma", "COPD"],
-        "emergency_medicine": ["emergency", "trauma", "resuscitation", "acute"],
-        "neurology": ["brain", "neurologic", "stroke", "seizure", "nervous system"]
-    }
+    def _determine_specialty(self, mesh_terms: List[str]) -> str:
+        """Determine medical specialty from MeSH terms"""
+        return _specialty_for_mesh_terms(tuple(mesh_terms))
     
-    mesh_text = " ".join(mesh_terms).lower()
-    
-    for specialty, keywords in specialty_keywords.items():
-        if any(keyword in mesh_text for keyword in keywords):
-            return specialty
-    
-    return "general_medicine"
-
-def load_expanded_medical_knowledge(self, specialties: List[str] = None) -> bool:
-    """Load expanded medical knowledge from multiple sources"""
-    try:
-        if specialties is None:
-            specialties = ["cardiology", "endocrinology", "emergency_medicine", "infectious_disease"]
-        
-        logger.info(f"Expanding medical knowledge for specialties: {specialties}")
-        
-        # Initialize knowledge expander
-        from services.literature_collector import MedicalKnowledgeExpander
-        expander = MedicalKnowledgeExpander()
-        
-        # Collect articles and guidelines
-        articles, guidelines = expander.expand_knowledge_base(specialties, articles_per_specialty=50)
-        
-        all_documents = []
+    def _collect_expanded_documents(self, specialties: List[str]) -> Tuple[List[Document], Counter, List[Dict]]:
+        """Chunk articles as the expander streams them in instead of holding every article"""
+        expander = self._get_knowledge_expander()
+        article_docs = []
+        article_specialties = Counter()
+        guidelines = []
         
-        # Process PubMed articles
-        if articles:
-            logger.info(f"Processing {len(articles)} research articles...")
-            article_docs = self.process_pubmed_articles(articles)
-            all_documents.extend(article_docs)
-        
-        # Process clinical guidelines
-        if guidelines:
-            logger.info(f"Processing {len(guidelines)} clinical guidelines...")
-            guideline_docs = self.process_clinical_guidelines(guidelines)
-            all_documents.extend(guideline_docs)
+        for item in expander.iter_knowledge_base(specialties, articles_per_specialty=50):
+            if isinstance(item, dict):
+                guidelines.append(item)
+            else:
+                article_specialties[getattr(item, 'specialty', 'unknown')] += 1
+                article_docs.extend(self.process_pubmed_articles([item]))
         
-        # Add to RAG service
-        if all_documents:
-            success = self.rag_service.add_documents(all_documents)
+        logger.info(f"Processed {sum(article_specialties.values())} research articles; processing {len(guidelines)} clinical guidelines...")
+        return article_docs + self.process_clinical_guidelines(guidelines), article_specialties, guidelines
+
+    async def load_expanded_medical_knowledge(self, specialties: List[str] = None) -> bool:
+        """Load expanded medical knowledge from multiple sources"""
+        try:
+            if specialties is None:
+                specialties = ["cardiology", "endocrinology", "emergency_medicine", "infectious_disease"]
             
-            if success:
-                logger.info(f"Successfully loaded {len(all_documents)} documents from {len(articles)} articles and {len(guidelines)} guidelines")
+            logger.info(f"Expanding medical knowledge for specialties: {specialties}")
+            
+            # Collect articles and guidelines, chunking articles while PubMed is still fetching
+            all_documents, article_specialties, guidelines = await asyncio.to_thread(
+                self._collect_expanded_documents, specialties
+            )
+            article_count = sum(article_specialties.values())
+            
+            # Add to RAG service
+            if all_documents:
+                # Filter lookups, batch building and the file writes below all block, so
+                # they run off the event loop like collection and upserting
+                all_documents = await asyncio.to_thread(self._drop_ingested_chunks, all_documents)
+                if not all_documents:
+                    logger.info("All processed documents were already in the knowledge base")
+                    return True
                 
-                # Save metadata for tracking
-                self._save_knowledge_metadata(articles, guidelines)
+                # Hand the RAG service one columnar batch instead of per-chunk dicts
+                batch = await asyncio.to_thread(DocumentBatch.from_documents, all_documents)
+                del all_documents
+                success = await asyncio.to_thread(self.rag_service.add_documents, batch)
                 
-                return True
+                if success:
+                    await asyncio.to_thread(self._record_ingested_chunks, batch.contents)
+                    logger.info(f"Successfully loaded {len(batch)} documents from {article_count} articles and {len(guidelines)} guidelines")
+                    
+                    # Save metadata for tracking
+                    await asyncio.to_thread(self._save_knowledge_metadata, article_specialties, guidelines)
+                    
+                    return True
+                else:
+                    logger.error("Failed to add documents to RAG service")
+                    return False
             else:
-                logger.error("Failed to add documents to RAG service")
+                logger.warning("No documents were processed")
                 return False
-        else:
-            logger.warning("No documents were processed")
+                
+        except Exception as e:
+            logger.error(f"Error loading expanded medical knowledge: {e}")
             return False
-            
-    except Exception as e:
-        logger.error(f"Error loading expanded medical knowledge: {e}")
-        return False
 
-def _save_knowledge_metadata(self, articles: List, guidelines: List[Dict]):
-    """Save metadata about loaded knowledge for tracking"""
-    try:
-        metadata = {
-            "last_updated": datetime.now().isoformat(),
-            "total_articles": len(articles),
-            "total_guidelines": len(guidelines),
-            "articles_by_specialty": {},
-            "guidelines_by_specialty": {},
-            "sources": {
-                "pubmed_articles": len(articles),
-                "clinical_guidelines": len(guidelines)
+    def _save_knowledge_metadata(self, article_specialties: Counter, guidelines: List[Dict]):
+        """Save metadata about loaded knowledge for tracking"""
+        try:
+            article_count = sum(article_specialties.values())
+            metadata = {
+                "last_updated": datetime.now().isoformat(),
+                "total_articles": article_count,
+                "total_guidelines": len(guidelines),
+                "articles_by_specialty": dict(article_specialties),
+                "guidelines_by_specialty": {},
+                "sources": {
+                    "pubmed_articles": article_count,
+                    "clinical_guidelines": len(guidelines)
+                }
             }
-        }
-        
-        # Count by specialty
-        for article in articles:
-            specialty = getattr(article, 'specialty', 'unknown')
-            metadata["articles_by_specialty"][specialty] = metadata["articles_by_specialty"].get(specialty, 0) + 1
-        
-        for guideline in guidelines:
-            specialty = guideline.get('specialty', 'unknown')
-            metadata["guidelines_by_specialty"][specialty] = metadata["guidelines_by_specialty"].get(specialty, 0) + 1
-        
-        # Save to file
-        os.makedirs('data/metadata', exist_ok=True)
-        with open('data/metadata/knowledge_base_info.json', 'w') as f:
-            json.dump(metadata, f, indent=2)
-        
-        logger.info("Knowledge base metadata saved")
-        
-    except Exception as e:
-        logger.warning(f"Could not save knowledge metadata: {e}")
\ No newline at end of file
+            
+            # Count by specialty
+            for guideline in guidelines:
+                specialty = guideline.get('specialty', 'unknown')
+                metadata["guidelines_by_specialty"][specialty] = metadata["guidelines_by_specialty"].get(specialty, 0) + 1
+            
+            # Save to file
+            os.makedirs('data/metadata', exist_ok=True)
+            with open('data/metadata/knowledge_base_info.json', 'wb') as f:
+                f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+            
+            logger.info("Knowledge base metadata saved")
+            
+        except Exception as e:
+            logger.warning(f"Could not save knowledge metadata: {e}")
\ No newline at end of file
@@ -1,38 +1,238 @@
 # backend/services/literature_collector.py
 import os
+import sys
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+import io
+from contextlib import closing
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 import logging
-from datetime import datetime, timedelta
-import json
+from datetime import date, timedelta
+from functools import lru_cache
 from dataclasses import dataclass
 from urllib.parse import quote
+from services.pubmed_cache import PubMedCache
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Exact paths from a PubmedArticle element, per the PubMed DTD. Unlike './/'
+# searches these never walk the whole subtree (or into the reference list).
+PMID_PATH = 'MedlineCitation/PMID'
+TITLE_PATH = 'MedlineCitation/Article/ArticleTitle'
+ABSTRACT_TEXT_PATH = 'MedlineCitation/Article/Abstract/AbstractText'
+JOURNAL_TITLE_PATH = 'MedlineCitation/Article/Journal/Title'
+PUB_YEAR_PATH = 'MedlineCitation/Article/Journal/JournalIssue/PubDate/Year'
+AUTHOR_PATH = 'MedlineCitation/Article/AuthorList/Author'
+PUBLICATION_TYPE_PATH = 'MedlineCitation/Article/PublicationTypeList/PublicationType'
+MESH_DESCRIPTOR_PATH = 'MedlineCitation/MeshHeadingList/MeshHeading/DescriptorName'
+KEYWORD_PATH = 'MedlineCitation/KeywordList/Keyword'
+ARTICLE_ID_PATH = 'PubmedData/ArticleIdList/ArticleId'
+
+# Retry policy for throttled or failing E-utilities calls, shared by both HTTP clients.
+# Status retries run in _get so each attempt draws from the rate limit
+HTTP_RETRY_TOTAL = 5
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Search filters shared by every esearch query
+QUALITY_FILTERS = "English[Language] AND humans[MeSH Terms] AND hasabstract[text]"
+
+@lru_cache(maxsize=8)
+def _date_filter(publication_years: int, today: date) -> str:
+    """PDat range clause; keyed on the day so the query string is stable within it"""
+    start_date = today - timedelta(days=365 * publication_years)
+    return f"(\"{start_date.strftime('%Y/%m/%d')}\"[PDat] : \"{today.strftime('%Y/%m/%d')}\"[PDat])"
+
+@dataclass(slots=True, frozen=True)
 class MedicalArticle:
     pmid: str
     title: str
     abstract: str
-    authors: List[str]
+    author_names: Tuple[Tuple[str, str], ...]  # (fore name, last name)
     journal: str
     publication_date: str
     doi: Optional[str]
-    keywords: List[str]
-    mesh_terms: List[str]
+    keywords: Tuple[str, ...]
+    mesh_terms: Tuple[str, ...]
     article_type: str
     url: str
+    
+    @property
+    def authors(self) -> List[str]:
+        """Formatted author names, built only when read"""
+        return [f"{first} {last}" for first, last in self.author_names]
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MedicalArticle":
+        """Rebuild an article from its serialized (field-name keyed) form"""
+        return cls(**{
+            **data,
+            'author_names': tuple((sys.intern(first), sys.intern(last)) for first, last in data['author_names']),
+            'keywords': tuple(data['keywords']),
+            'mesh_terms': tuple(data['mesh_terms']),
+            'journal': sys.intern(data['journal']),
+            'article_type': sys.intern(data['article_type'])
+        })
+
+@dataclass
+class SearchHandle:
+    """PMIDs from an esearch call plus its NCBI history-server reference"""
+    pmids: List[str]
+    webenv: Optional[str] = None
+    query_key: Optional[str] = None
+    
+    @property
+    def has_history(self) -> bool:
+        return bool(self.webenv and self.query_key)
+
+class _ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks"""
+    
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b""
+                return 0
+        
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter on the monotonic clock"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate  # Tokens added per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                wait = (1 - self.tokens) / self.rate
+            
+            time.sleep(wait)
 
 class PubMedCollector:
     def __init__(self):
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
         self.email = os.getenv("PUBMED_EMAIL", "your-email@example.com")  # Required by NCBI
         self.api_key = os.getenv("PUBMED_API_KEY")  # Optional but recommended
-        self.rate_limit = 0.34  # Seconds between requests (3 per second max)
         
+        # NCBI allows 10 requests/second with an API key, 3 without. A single-token
+        # bucket keeps every one-second window within that budget.
+        self.requests_per_second = 10 if self.api_key else 3
+        self.limiter = TokenBucket(rate=self.requests_per_second, capacity=1)
+        self.max_concurrency = self.requests_per_second
+        self._request_slots = threading.BoundedSemaphore(self.max_concurrency)
+        
+        # Reuse keep-alive connections to eutils instead of a new TCP/TLS handshake per call.
+        # The adapter only retries failed connects, which never reach NCBI or count
+        # against its limit; retries on a response status go through _get
+        self.session = requests.Session()
+        retry = Retry(
+            total=None,
+            connect=HTTP_RETRY_TOTAL,
+            read=0,
+            status=0,
+            backoff_factor=HTTP_RETRY_BACKOFF,
+            allowed_methods=["GET"]
+        )
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+        
+        # Parameters NCBI expects on every E-utilities request
+        self.session.params = {'email': self.email}
+        if self.api_key:
+            self.session.params['api_key'] = self.api_key
+        
+        # Optional HTTP/2 client: multiplexes concurrent calls over one TLS connection
+        self.http2_client = None
+        if os.getenv("PUBMED_HTTP2", "False").lower() == "true":
+            self.http2_client = self._create_http2_client()
+        
+        # Parsed results of repeated queries are reused for a day
+        self.cache = PubMedCache()
+    
+    def _create_http2_client(self):
+        """Build an httpx HTTP/2 client, or None if the http2 extra is not installed"""
+        try:
+            import httpx
+            import h2  # noqa: F401  # Required by httpx for HTTP/2
+        except ImportError:
+            logger.warning("PUBMED_HTTP2 is set but httpx[http2] is not installed; using HTTP/1.1")
+            return None
+        
+        # httpx advertises gzip/deflate, plus br when brotli is installed, and decodes transparently
+        return httpx.Client(
+            http2=True,
+            params=dict(self.session.params),
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+        )
+    
+    def close(self):
+        """Release pooled HTTP connections and the result cache"""
+        self.session.close()
+        if self.http2_client is not None:
+            self.http2_client.close()
+        self.cache.close()
+    
+    def _get(self, endpoint: str, params: Dict[str, Any], stream: bool = False):
+        """Issue a rate-limited GET against an E-utilities endpoint, retrying throttled or failed calls"""
+        url = f"{self.base_url}/{endpoint}"
+        with self._request_slots:
+            for attempt in range(HTTP_RETRY_TOTAL + 1):
+                # Every attempt, retries included, takes a token so a burst of 429s
+                # can't push the request rate past NCBI's limit
+                self.limiter.acquire()
+                response = self._send(url, params, stream)
+                if response.status_code not in HTTP_RETRY_STATUSES or attempt == HTTP_RETRY_TOTAL:
+                    return response
+                
+                response.close()
+                retry_after = response.headers.get("Retry-After", "")
+                time.sleep(float(retry_after) if retry_after.isdigit() else HTTP_RETRY_BACKOFF * 2 ** attempt)
+    
+    def _send(self, url: str, params: Dict[str, Any], stream: bool):
+        """Send one GET over the HTTP/2 client if enabled, else the requests session"""
+        if self.http2_client is not None:
+            request = self.http2_client.build_request("GET", url, params=params)
+            return self.http2_client.send(request, stream=stream)
+        return self.session.get(url, params=params, stream=stream)
+    
+    def _response_body(self, response) -> io.RawIOBase:
+        """File-like view of a streamed response body, decompressed"""
+        if isinstance(response, requests.Response):
+            response.raw.decode_content = True  # Transparently gunzip
+            return response.raw
+        return _ChunkReader(response.iter_bytes())
+    
     def search_articles(
         self, 
         query: str, 
@@ -41,6 +241,16 @@ class PubMedCollector:
         article_types: List[str] = None
     ) -> List[str]:
         """Search PubMed and return list of PMIDs"""
+        return self.search(query, max_results, publication_years, article_types).pmids
+    
+    def search(
+        self, 
+        query: str, 
+        max_results: int = 100,
+        publication_years: int = 5,
+        article_types: List[str] = None
+    ) -> SearchHandle:
+        """Search PubMed, keeping the result set on NCBI's history server"""
         
         if article_types is None:
             article_types = [
@@ -55,10 +265,7 @@ class PubMedCollector:
         search_terms = [query]
         
         # Add date filter
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=365 * publication_years)
-        date_filter = f"(\"{start_date.strftime('%Y/%m/%d')}\"[PDat] : \"{end_date.strftime('%Y/%m/%d')}\"[PDat])"
-        search_terms.append(date_filter)
+        search_terms.append(_date_filter(publication_years, date.today()))
         
         # Add article type filters
         if article_types:
@@ -66,11 +273,7 @@ class PubMedCollector:
             search_terms.append(f"({type_filter})")
         
         # Add quality filters
-        search_terms.extend([
-            "English[Language]",
-            "humans[MeSH Terms]",
-            "hasabstract[text]"
-        ])
+        search_terms.append(QUALITY_FILTERS)
         
         full_query = " AND ".join(search_terms)
         
@@ -79,66 +282,101 @@ class PubMedCollector:
             'term': full_query,
             'retmax': max_results,
             'retmode': 'xml',
-            'email': self.email,
             'sort': 'relevance'
         }
         
-        if self.api_key:
-            params['api_key'] = self.api_key
+        # History sessions expire on NCBI's side, so cached hits only carry PMIDs
+        cache_key = self.cache.key_for("esearch", params)
+        cached_pmids = self.cache.get(cache_key)
+        if cached_pmids is not None:
+            logger.info(f"Found {len(cached_pmids)} cached articles for query: {query}")
+            return SearchHandle(pmids=cached_pmids)
             
         try:
-            response = requests.get(f"{self.base_url}/esearch.fcgi", params=params)
-            time.sleep(self.rate_limit)
+            response = self._get("esearch.fcgi", {**params, 'usehistory': 'y'})
             
             if response.status_code == 200:
                 root = ET.fromstring(response.content)
-                pmids = [pmid.text for pmid in root.findall('.//Id')]
+                pmids = [pmid.text for pmid in root.iterfind('IdList/Id')]
                 logger.info(f"Found {len(pmids)} articles for query: {query}")
-                return pmids
+                self.cache.put(cache_key, pmids)
+                return SearchHandle(
+                    pmids=pmids,
+                    webenv=root.findtext('WebEnv'),
+                    query_key=root.findtext('QueryKey')
+                )
             else:
                 logger.error(f"PubMed search failed: {response.status_code}")
-                return []
+                return SearchHandle(pmids=[])
                 
         except Exception as e:
             logger.error(f"Error searching PubMed: {e}")
-            return []
+            return SearchHandle(pmids=[])
     
-    def fetch_article_details(self, pmids: List[str]) -> List[MedicalArticle]:
-        """Fetch detailed information for list of PMIDs"""
+    def fetch_article_details(
+        self,
+        pmids: Union[List[str], SearchHandle],
+        max_articles: Optional[int] = None
+    ) -> List[MedicalArticle]:
+        """Fetch detailed information for list of PMIDs or a search handle"""
+        handle = pmids if isinstance(pmids, SearchHandle) else SearchHandle(pmids=pmids)
+        pmid_list = handle.pmids[:max_articles] if max_articles is not None else handle.pmids
         articles = []
         
         # Process in batches of 200 (NCBI limit)
         batch_size = 200
-        for i in range(0, len(pmids), batch_size):
-            batch_pmids = pmids[i:i + batch_size]
-            batch_articles = self._fetch_batch_details(batch_pmids)
+        for i in range(0, len(pmid_list), batch_size):
+            batch_pmids = pmid_list[i:i + batch_size]
+            batch_articles = self._fetch_batch_details(batch_pmids, handle, retstart=i)
             articles.extend(batch_articles)
             
         return articles
     
-    def _fetch_batch_details(self, pmids: List[str]) -> List[MedicalArticle]:
+    def _fetch_batch_details(
+        self,
+        pmids: List[str],
+        handle: Optional[SearchHandle] = None,
+        retstart: int = 0
+    ) -> List[MedicalArticle]:
         """Fetch details for a batch of PMIDs"""
-        pmid_str = ",".join(pmids)
-        
-        params = {
-            'db': 'pubmed',
-            'id': pmid_str,
-            'retmode': 'xml',
-            'email': self.email
-        }
+        if handle is not None and handle.has_history:
+            # Page through the server-side result set instead of re-sending every PMID
+            params = {
+                'db': 'pubmed',
+                'WebEnv': handle.webenv,
+                'query_key': handle.query_key,
+                'retstart': retstart,
+                'retmax': len(pmids),
+                'retmode': 'xml'
+            }
+        else:
+            params = {
+                'db': 'pubmed',
+                'id': ",".join(pmids),
+                'retmode': 'xml'
+            }
         
-        if self.api_key:
-            params['api_key'] = self.api_key
+        # Cached batches skip both the download and the XML parse; key on the
+        # PMIDs so history and id= requests for the same batch share an entry
+        cache_key = self.cache.key_for("efetch/v2", {'db': 'pubmed', 'id': ",".join(pmids), 'retmode': 'xml'})
+        cached_articles = self.cache.get(cache_key)
+        if cached_articles is not None:
+            return [MedicalArticle.from_dict(article) for article in cached_articles]
             
         try:
-            response = requests.get(f"{self.base_url}/efetch.fcgi", params=params)
-            time.sleep(self.rate_limit)
-            
-            if response.status_code == 200:
-                return self._parse_pubmed_xml(response.content)
-            else:
-                logger.error(f"PubMed fetch failed: {response.status_code}")
-                return []
+            # Parse while the body downloads instead of buffering it first
+            with closing(self._get("efetch.fcgi", params, stream=True)) as response:
+                if response.status_code == 200:
+                    articles, complete = self._parse_pubmed_stream(self._response_body(response))
+                    # Only a fully parsed body is cached; a truncated one would hide the
+                    # missing articles until the entry expires. orjson serializes the
+                    # dataclasses natively, without asdict()'s deep copies
+                    if complete:
+                        self.cache.put(cache_key, articles)
+                    return articles
+                else:
+                    logger.error(f"PubMed fetch failed: {response.status_code}")
+                    return []
                 
         except Exception as e:
             logger.error(f"Error fetching PubMed details: {e}")
@@ -146,92 +384,117 @@ class PubMedCollector:
     
     def _parse_pubmed_xml(self, xml_content: bytes) -> List[MedicalArticle]:
         """Parse PubMed XML response into MedicalArticle objects"""
+        articles, _ = self._parse_pubmed_stream(io.BytesIO(xml_content))
+        return articles
+    
+    def _parse_pubmed_stream(self, source) -> Tuple[List[MedicalArticle], bool]:
+        """Incrementally parse PubMed XML, keeping only one article in memory at a time.
+        
+        Returns the articles parsed and whether the whole body was read; a stream or
+        XML error mid-body returns the articles before it with ``False``.
+        """
         articles = []
         
         try:
-            root = ET.fromstring(xml_content)
+            context = ET.iterparse(source, events=('start', 'end'))
+            _, root = next(context)
             
-            for article_elem in root.findall('.//PubmedArticle'):
+            for event, elem in context:
+                if event != 'end' or elem.tag != 'PubmedArticle':
+                    continue
+                
                 try:
-                    # Extract PMID
-                    pmid_elem = article_elem.find('.//PMID')
-                    pmid = pmid_elem.text if pmid_elem is not None else ""
-                    
-                    # Extract basic info
-                    title_elem = article_elem.find('.//ArticleTitle')
-                    title = title_elem.text if title_elem is not None else ""
-                    
-                    abstract_elem = article_elem.find('.//AbstractText')
-                    abstract = abstract_elem.text if abstract_elem is not None else ""
-                    
-                    # Extract journal info
-                    journal_elem = article_elem.find('.//Journal/Title')
-                    journal = journal_elem.text if journal_elem is not None else ""
-                    
-                    # Extract authors
-                    authors = []
-                    for author in article_elem.findall('.//Author'):
-                        lastname = author.find('LastName')
-                        firstname = author.find('ForeName')
-                        if lastname is not None and firstname is not None:
-                            authors.append(f"{firstname.text} {lastname.text}")
-                    
-                    # Extract publication date
-                    pub_date = ""
-                    date_elem = article_elem.find('.//PubDate/Year')
-                    if date_elem is not None:
-                        pub_date = date_elem.text
-                    
-                    # Extract DOI
-                    doi = ""
-                    for article_id in article_elem.findall('.//ArticleId'):
-                        if article_id.get('IdType') == 'doi':
-                            doi = article_id.text
-                            break
-                    
-                    # Extract MeSH terms
-                    mesh_terms = []
-                    for mesh in article_elem.findall('.//MeshHeading/DescriptorName'):
-                        mesh_terms.append(mesh.text)
-                    
-                    # Extract keywords
-                    keywords = []
-                    for keyword in article_elem.findall('.//Keyword'):
-                        keywords.append(keyword.text)
-                    
-                    # Extract article type
-                    article_type = "Research Article"
-                    pub_type = article_elem.find('.//PublicationType')
-                    if pub_type is not None:
-                        article_type = pub_type.text
-                    
-                    # Create URL
-                    url = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-                    
-                    if pmid and title and abstract:
-                        article = MedicalArticle(
-                            pmid=pmid,
-                            title=title,
-                            abstract=abstract,
-                            authors=authors,
-                            journal=journal,
-                            publication_date=pub_date,
-                            doi=doi,
-                            keywords=keywords,
-                            mesh_terms=mesh_terms,
-                            article_type=article_type,
-                            url=url
-                        )
+                    article = self._parse_article(elem)
+                    if article is not None:
                         articles.append(article)
-                        
                 except Exception as e:
                     logger.warning(f"Error parsing individual article: {e}")
-                    continue
+                
+                # Discard articles that have already been converted
+                root.clear()
                     
         except Exception as e:
             logger.error(f"Error parsing PubMed XML: {e}")
+            return articles, False
             
-        return articles
+        return articles, True
+    
+    def _parse_article(self, article_elem: ET.Element) -> Optional[MedicalArticle]:
+        """Convert one PubmedArticle element into a MedicalArticle"""
+        # Extract PMID
+        pmid_elem = article_elem.find(PMID_PATH)
+        pmid = pmid_elem.text if pmid_elem is not None else ""
+        
+        # Extract basic info
+        # itertext keeps inline markup such as <i> or <sup> from truncating the text
+        title_elem = article_elem.find(TITLE_PATH)
+        title = "".join(title_elem.itertext()) if title_elem is not None else ""
+        
+        # Structured abstracts are split into labelled AbstractText sections
+        abstract = " ".join(filter(None, (
+            "".join(section.itertext()) for section in article_elem.iterfind(ABSTRACT_TEXT_PATH)
+        )))
+        
+        # Journal, author and type strings repeat heavily across a corpus, so intern them
+        journal_elem = article_elem.find(JOURNAL_TITLE_PATH)
+        journal = sys.intern(journal_elem.text) if journal_elem is not None and journal_elem.text else ""
+        
+        # Extract authors
+        author_names = []
+        for author in article_elem.iterfind(AUTHOR_PATH):
+            lastname = author.findtext('LastName')
+            firstname = author.findtext('ForeName')
+            if lastname is not None and firstname is not None:
+                author_names.append((sys.intern(firstname), sys.intern(lastname)))
+        
+        # Extract publication date
+        pub_date = ""
+        date_elem = article_elem.find(PUB_YEAR_PATH)
+        if date_elem is not None:
+            pub_date = date_elem.text
+        
+        # Extract DOI
+        doi = ""
+        for article_id in article_elem.iterfind(ARTICLE_ID_PATH):
+            if article_id.get('IdType') == 'doi':
+                doi = article_id.text
+                break
+        
+        # Extract MeSH terms
+        mesh_terms = []
+        for mesh in article_elem.iterfind(MESH_DESCRIPTOR_PATH):
+            mesh_terms.append(mesh.text)
+        
+        # Extract keywords
+        keywords = []
+        for keyword in article_elem.iterfind(KEYWORD_PATH):
+            keywords.append(keyword.text)
+        
+        # Extract article type
+        article_type = "Research Article"
+        pub_type = article_elem.find(PUBLICATION_TYPE_PATH)
+        if pub_type is not None and pub_type.text:
+            article_type = sys.intern(pub_type.text)
+        
+        # Create URL
+        url = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+        
+        if pmid and title and abstract:
+            return MedicalArticle(
+                pmid=pmid,
+                title=title,
+                abstract=abstract,
+                author_names=tuple(author_names),
+                journal=journal,
+                publication_date=pub_date,
+                doi=doi,
+                keywords=tuple(keywords),
+                mesh_terms=tuple(mesh_terms),
+                article_type=article_type,
+                url=url
+            )
+        
+        return None
 
 class GuidelineCollector:
     """Collect clinical guidelines from major medical organizations"""
@@ -313,6 +576,23 @@ class MedicalKnowledgeExpander:
         
     def expand_knowledge_base(self, specialties: List[str], articles_per_specialty: int = 100):
         """Expand knowledge base across multiple specialties"""
+        all_articles = []
+        all_guidelines = []
+        
+        for item in self.iter_knowledge_base(specialties, articles_per_specialty):
+            if isinstance(item, MedicalArticle):
+                all_articles.append(item)
+            else:
+                all_guidelines.append(item)
+        
+        return all_articles, all_guidelines
+    
+    def iter_knowledge_base(
+        self,
+        specialties: List[str],
+        articles_per_specialty: int = 100
+    ) -> Iterator[Union[MedicalArticle, Dict[str, Any]]]:
+        """Stream guidelines and then research articles as they are collected"""
         
         specialty_queries = {
             "cardiology": [
@@ -352,26 +632,80 @@ class MedicalKnowledgeExpander:
             ]
         }
         
-        all_articles = []
-        all_guidelines = []
+        query_jobs = []
         
         for specialty in specialties:
             logger.info(f"Expanding knowledge for {specialty}...")
             
             # Collect guidelines
-            guidelines = self.guideline_collector.collect_guidelines(specialty)
-            all_guidelines.extend(guidelines)
+            yield from self.guideline_collector.collect_guidelines(specialty)
             
-            # Collect research articles
+            # Queue research article queries
             if specialty in specialty_queries:
+                max_results = articles_per_specialty // len(specialty_queries[specialty])
                 for query in specialty_queries[specialty]:
-                    pmids = self.pubmed_collector.search_articles(
-                        query, 
-                        max_results=articles_per_specialty // len(specialty_queries[specialty])
-                    )
-                    
-                    if pmids:
-                        articles = self.pubmed_collector.fetch_article_details(pmids[:20])  # Limit for demo
-                        all_articles.extend(articles)
+                    query_jobs.append((query, max_results))
+        
+        # Run the PubMed round-trips concurrently; the collector keeps them within NCBI's rate limit
+        if query_jobs:
+            yield from self._stream_articles_pipelined(query_jobs)
+    
+    def _stream_articles_pipelined(self, query_jobs: List[tuple]) -> Iterator[MedicalArticle]:
+        """Overlap esearch and efetch, yielding articles as each fetch batch is parsed.
         
-        return all_articles, all_guidelines
\ No newline at end of file
+        Search workers feed a bounded queue of history handles that fetch workers
+        drain; parsed articles are handed back to the caller in completion order.
+        """
+        workers = self.pubmed_collector.max_concurrency
+        handles = queue.Queue(maxsize=32)  # Backpressure if fetches fall behind searches
+        fetched = queue.Queue()
+        claimed_pmids = set()  # Specialty queries overlap; fetch each PMID only once
+        claimed_lock = threading.Lock()
+        
+        def produce(query: str, max_results: int):
+            handle = self.pubmed_collector.search(query, max_results=max_results)
+            pmids = handle.pmids[:20]  # Limit for demo
+            with claimed_lock:
+                new_pmids = [pmid for pmid in pmids if pmid not in claimed_pmids]
+                claimed_pmids.update(new_pmids)
+            
+            if not new_pmids:
+                return
+            if len(new_pmids) < len(pmids):
+                # The history-server result set would re-fetch the overlap, so fall back to ids
+                handle = SearchHandle(pmids=new_pmids)
+            handles.put(handle)
+        
+        def search_all():
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as searchers:
+                    for query, max_results in query_jobs:
+                        searchers.submit(produce, query, max_results)
+            finally:
+                for _ in range(workers):
+                    handles.put(None)
+        
+        def consume():
+            try:
+                while True:
+                    handle = handles.get()
+                    if handle is None:
+                        return
+                    articles = self.pubmed_collector.fetch_article_details(handle, max_articles=20)
+                    for article in articles:
+                        fetched.put(article)
+            finally:
+                fetched.put(None)
+        
+        with ThreadPoolExecutor(max_workers=workers + 1) as executor:
+            executor.submit(search_all)
+            for _ in range(workers):
+                executor.submit(consume)
+            
+            finished = 0
+            while finished < workers:
+                article = fetched.get()
+                if article is None:
+                    finished += 1
+                else:
+                    yield article
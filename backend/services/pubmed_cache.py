@@ -0,0 +1,70 @@
+# backend/services/pubmed_cache.py
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+import orjson
+
+logger = logging.getLogger(__name__)
+
+class PubMedCache:
+    """SQLite-backed cache of parsed E-utilities results with a freshness window.
+
+    NCBI does not reliably send ETags, so results are cached after parsing
+    (PMID lists for esearch, article records for efetch) and reused until
+    they are older than ``ttl_seconds``.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = 86400):
+        self.path = path or os.getenv("PUBMED_CACHE_PATH", "data/cache/pubmed.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def key_for(self, endpoint: str, params: Dict[str, Any]) -> str:
+        """Build a stable key from the endpoint and its normalized parameters"""
+        payload = orjson.dumps({"endpoint": endpoint, "params": params}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or stale"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return orjson.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        try:
+            payload = orjson.dumps(value)
+        except TypeError as e:
+            logger.warning(f"Could not cache PubMed result: {e}")
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, payload, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,5 +1,9 @@
 # backend/services/quality_control.py
+import os
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from collections import Counter
 from typing import List, Dict, Any
 from services.rag_service import RAGService
 import re
@@ -7,6 +11,65 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+MEDICAL_KEYWORDS = (
+    'patient', 'treatment', 'diagnosis', 'therapy', 'clinical',
+    'medical', 'disease', 'syndrome', 'medicine', 'healthcare',
+    'hospital', 'physician', 'nurse', 'drug', 'medication'
+)
+
+def _compile_keyword_scanner(excluded_keywords: List[str]) -> re.Pattern:
+    """One pattern over excluded and medical keywords, with substring semantics like
+    the original `keyword in content` checks; the lookahead reports overlapping hits"""
+    alternation = '|'.join(map(re.escape, [*excluded_keywords, *MEDICAL_KEYWORDS]))
+    return re.compile(f'(?=({alternation}))', re.IGNORECASE)
+
+def _passes_keyword_scan(content: str, keyword_pattern: re.Pattern, excluded_keywords: frozenset) -> bool:
+    """Reject on any excluded keyword, otherwise require two distinct medical keywords"""
+    found_keywords = set()
+    for match in keyword_pattern.finditer(content):
+        keyword = match.group(1).lower()
+        if keyword in excluded_keywords:
+            return False
+        found_keywords.add(keyword)
+    
+    return len(found_keywords) >= 2  # Require at least 2 medical keywords
+
+# Below this many documents, worker start-up costs more than the checks themselves
+PARALLEL_VALIDATION_THRESHOLD = 2000
+
+def _meets_quality_criteria(
+    doc: Dict,
+    min_abstract_length: int,
+    required_mesh_terms: int,
+    keyword_pattern: re.Pattern,
+    excluded_keywords: frozenset
+) -> bool:
+    """Check if document meets quality criteria (module-level so worker processes can pickle it)"""
+    content = doc.get('content', '')
+    metadata = doc.get('metadata', {})
+    
+    # Cheap O(1) checks first so failing documents skip the content scans
+    # Check minimum length
+    if len(content) < min_abstract_length:
+        return False
+    
+    # Require MeSH terms for PubMed articles
+    if metadata.get('document_type') == 'research_paper':
+        mesh_terms = metadata.get('mesh_terms', [])
+        if len(mesh_terms) < required_mesh_terms:
+            return False
+    
+    # Excluded keywords and medical relevance in a single pass over the content
+    return _passes_keyword_scan(content, keyword_pattern, excluded_keywords)
+
+def _publication_year_range(year: Any) -> str:
+    """Bucket a publication year into a 5-year range label"""
+    try:
+        year = int(str(year)[:4])  # Extract year
+        return f"{(year//5)*5}-{(year//5)*5+4}"
+    except:
+        return 'unknown'
+
 class MedicalQualityController:
     """Ensure quality and accuracy of medical knowledge"""
     
@@ -22,13 +85,29 @@ class MedicalQualityController:
             "editorial",
             "commentary"
         ]
+        self._excluded_set = frozenset(keyword.lower() for keyword in self.excluded_keywords)
+        self._keyword_pattern = _compile_keyword_scanner(self.excluded_keywords)
         
     def validate_medical_content(self, documents: List[Dict]) -> List[Dict]:
         """Validate medical content for quality and relevance"""
-        validated_docs = []
+        check = partial(
+            _meets_quality_criteria,
+            min_abstract_length=self.min_abstract_length,
+            required_mesh_terms=self.required_mesh_terms,
+            keyword_pattern=self._keyword_pattern,
+            excluded_keywords=self._excluded_set
+        )
+        
+        if len(documents) >= PARALLEL_VALIDATION_THRESHOLD:
+            # The checks are pure CPU work, so spread them across cores
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                keep_mask = list(executor.map(check, documents, chunksize=64))
+        else:
+            keep_mask = [check(doc) for doc in documents]
         
-        for doc in documents:
-            if self._meets_quality_criteria(doc):
+        validated_docs = []
+        for doc, keep in zip(documents, keep_mask):
+            if keep:
                 validated_docs.append(doc)
             else:
                 logger.warning(f"Document failed quality check: {doc.get('title', 'Unknown')}")
@@ -38,42 +117,10 @@ class MedicalQualityController:
     
     def _meets_quality_criteria(self, doc: Dict) -> bool:
         """Check if document meets quality criteria"""
-        content = doc.get('content', '')
-        metadata = doc.get('metadata', {})
-        
-        # Check minimum length
-        if len(content) < self.min_abstract_length:
-            return False
-        
-        # Check for excluded keywords
-        content_lower = content.lower()
-        if any(keyword in content_lower for keyword in self.excluded_keywords):
-            return False
-        
-        # Require MeSH terms for PubMed articles
-        if metadata.get('document_type') == 'research_paper':
-            mesh_terms = metadata.get('mesh_terms', [])
-            if len(mesh_terms) < self.required_mesh_terms:
-                return False
-        
-        # Check for medical relevance
-        if not self._is_medically_relevant(content, metadata):
-            return False
-        
-        return True
-    
-    def _is_medically_relevant(self, content: str, metadata: Dict) -> bool:
-        """Check if content is medically relevant"""
-        medical_keywords = [
-            'patient', 'treatment', 'diagnosis', 'therapy', 'clinical',
-            'medical', 'disease', 'syndrome', 'medicine', 'healthcare',
-            'hospital', 'physician', 'nurse', 'drug', 'medication'
-        ]
-        
-        content_lower = content.lower()
-        relevance_score = sum(1 for keyword in medical_keywords if keyword in content_lower)
-        
-        return relevance_score >= 2  # Require at least 2 medical keywords
+        return _meets_quality_criteria(
+            doc, self.min_abstract_length, self.required_mesh_terms,
+            self._keyword_pattern, self._excluded_set
+        )
 
 class KnowledgeBaseMonitor:
     """Monitor and maintain knowledge base quality"""
@@ -112,42 +159,31 @@ class KnowledgeBaseMonitor:
     
     def _analyze_document_distribution(self, documents: List[Dict]) -> Dict[str, Any]:
         """Analyze distribution of document types and characteristics"""
-        doc_types = {}
-        evidence_levels = {}
-        specialties = {}
-        publication_years = {}
+        metadatas = [doc.get('metadata', {}) for doc in documents]
         
-        for doc in documents:
-            metadata = doc.get('metadata', {})
-            
-            # Document type distribution
-            doc_type = metadata.get('document_type', 'unknown')
-            doc_types[doc_type] = doc_types.get(doc_type, 0) + 1
-            
-            # Evidence level distribution
-            evidence_level = metadata.get('evidence_level', 'unknown')
-            evidence_levels[evidence_level] = evidence_levels.get(evidence_level, 0) + 1
-            
-            # Specialty distribution
-            specialty = metadata.get('specialty', 'unknown')
-            specialties[specialty] = specialties.get(specialty, 0) + 1
-            
-            # Publication year distribution
-            year = metadata.get('publication_year', 'unknown')
-            if year != 'unknown':
-                try:
-                    year = int(str(year)[:4])  # Extract year
-                    year_range = f"{(year//5)*5}-{(year//5)*5+4}"  # Group by 5-year ranges
-                    publication_years[year_range] = publication_years.get(year_range, 0) + 1
-                except:
-                    publication_years['unknown'] = publication_years.get('unknown', 0) + 1
+        doc_types = Counter(metadata.get('document_type', 'unknown') for metadata in metadatas)
+        evidence_levels = Counter(metadata.get('evidence_level', 'unknown') for metadata in metadatas)
+        specialties = Counter(metadata.get('specialty', 'unknown') for metadata in metadatas)
+        
+        # Publication year distribution, grouped by 5-year ranges
+        publication_years = Counter(
+            _publication_year_range(year)
+            for year in (metadata.get('publication_year', 'unknown') for metadata in metadatas)
+            if year != 'unknown'
+        )
+        
+        # Summary figures for _generate_recommendations, derived from the counters above
+        total_docs = len(documents)
+        recent_year_ranges = sum(1 for year_range in publication_years if year_range.startswith('202'))
         
         return {
-            "document_types": doc_types,
-            "evidence_levels": evidence_levels,
-            "specialties": specialties,
-            "publication_years": publication_years,
-            "total_analyzed": len(documents)
+            "document_types": dict(doc_types),
+            "evidence_levels": dict(evidence_levels),
+            "specialties": dict(specialties),
+            "publication_years": dict(publication_years),
+            "total_analyzed": total_docs,
+            "level_a_ratio": evidence_levels['A'] / total_docs if total_docs else 0.0,
+            "recent_year_ranges": recent_year_ranges
         }
     
     def _calculate_quality_metrics(self, documents: List[Dict]) -> Dict[str, float]:
@@ -185,12 +221,8 @@ class KnowledgeBaseMonitor:
         recommendations = []
         
         # Check evidence level distribution
-        evidence_levels = doc_analysis.get('evidence_levels', {})
-        total_docs = sum(evidence_levels.values())
-        
-        if total_docs > 0:
-            level_a_ratio = evidence_levels.get('A', 0) / total_docs
-            if level_a_ratio < 0.3:
+        if doc_analysis.get('total_analyzed', 0) > 0:
+            if doc_analysis['level_a_ratio'] < 0.3:
                 recommendations.append("Consider adding more high-quality evidence (Level A) sources")
         
         # Check specialty coverage
@@ -204,9 +236,7 @@ class KnowledgeBaseMonitor:
             recommendations.append("Add more clinical practice guidelines")
         
         # Check publication recency
-        pub_years = doc_analysis.get('publication_years', {})
-        recent_years = [k for k in pub_years.keys() if k.startswith('202')]
-        if len(recent_years) < 2:
+        if doc_analysis.get('recent_year_ranges', 0) < 2:
             recommendations.append("Include more recent publications (2020+)")
         
         if not recommendations:
@@ -0,0 +1,113 @@
+# backend/services/query_cache.py
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import orjson
+
+class SemanticQueryCache:
+    """In-memory cache of retrieval results keyed by query text and meaning.
+
+    Repeats of the same query (ignoring case and whitespace) are served from
+    a dict without embedding the query. Entries only match queries issued
+    with the same ``top_k`` and filter.
+
+    With ``semantic`` enabled, reworded queries are also matched: the query
+    embedding is compared against a ring buffer of recent (L2-normalized)
+    query embeddings in one matrix-vector product, and a stored result is
+    reused when cosine similarity clears ``threshold``. This is off by
+    default because clinically different queries ("aspirin in chest pain"
+    vs. "aspirin contraindications in chest pain") can clear the threshold.
+    The buffer is kept in float16 and widened only for the product.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 4096,
+        dimension: int = 1536,
+        threshold: float = 0.97,
+        semantic: bool = False
+    ):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.semantic = semantic
+        self._vectors = np.zeros((capacity if semantic else 0, dimension), dtype=np.float16)
+        self._filled = 0  # Slots in use; the ring fills from slot 0
+        self._scopes = np.full(capacity, -1, dtype=np.int64)  # Scope id per slot, -1 if empty
+        self._slot_keys: List[Optional[Tuple[str, str]]] = [None] * capacity
+        self._results: List[Optional[List[Dict[str, Any]]]] = [None] * capacity
+        self._exact: Dict[Tuple[str, str], int] = {}
+        self._scope_ids: Dict[str, int] = {}
+        self._next_slot = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def scope_for(top_k: int, filter_dict: Optional[Dict[str, Any]], mmr_lambda: Optional[float] = None) -> str:
+        """Key for the search parameters a cached result depends on"""
+        return orjson.dumps(
+            {"top_k": top_k, "filter": filter_dict, "mmr_lambda": mmr_lambda}, option=orjson.OPT_SORT_KEYS
+        ).decode()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Exact-match key for a query: case-folded with whitespace collapsed"""
+        return " ".join(query.casefold().split())
+
+    def get_exact(self, query: str, scope: str) -> Optional[List[Dict[str, Any]]]:
+        key = (self.normalize_query(query), scope)
+        with self._lock:
+            slot = self._exact.get(key)
+            return list(self._results[slot]) if slot is not None else None
+
+    def get_similar(self, embedding: List[float], scope: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the result of the most similar cached query, if similar enough"""
+        if not self.semantic:
+            return None
+        query_vector = self._normalize(embedding)
+        with self._lock:
+            scope_id = self._scope_ids.get(scope)
+            filled = self._filled
+            if scope_id is None or not filled:
+                return None
+
+            similarities = self._vectors[:filled].astype(np.float32) @ query_vector
+            similarities[self._scopes[:filled] != scope_id] = -1.0
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            return list(self._results[best])
+
+    def put(self, query: str, scope: str, embedding: List[float], results: List[Dict[str, Any]]):
+        key = (self.normalize_query(query), scope)
+        with self._lock:
+            scope_id = self._scope_ids.setdefault(scope, len(self._scope_ids))
+
+            # Overwrite the oldest slot once the buffer is full
+            slot = self._next_slot
+            self._next_slot = (slot + 1) % self.capacity
+            self._filled = max(self._filled, slot + 1)
+            evicted = self._slot_keys[slot]
+            if evicted is not None and self._exact.get(evicted) == slot:
+                del self._exact[evicted]
+
+            if self.semantic:
+                self._vectors[slot] = self._normalize(embedding)
+            self._scopes[slot] = scope_id
+            self._slot_keys[slot] = key
+            self._results[slot] = list(results)
+            self._exact[key] = slot
+
+    def clear(self):
+        """Drop every cached result, e.g. after the index changes"""
+        with self._lock:
+            self._scopes.fill(-1)
+            self._slot_keys = [None] * self.capacity
+            self._results = [None] * self.capacity
+            self._exact.clear()
+            self._next_slot = 0
+            self._filled = 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -1,22 +1,169 @@
 # backend/services/rag_service.py
 import os
 import openai
+import httpx
 from pinecone import Pinecone, ServerlessSpec
+from pinecone.exceptions import NotFoundException
+import math
+import time
+import asyncio
+import importlib.util
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import numpy as np
-from typing import List, Dict, Any, Optional
+import pandas as pd
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
 import logging
 from dataclasses import dataclass
 import hashlib
 import json
+from services.embedding_cache import EmbeddingCache
+from services.query_cache import SemanticQueryCache
+from services.content_store import ContentStore
+from services.bloom_filter import BloomFilter
 
 logger = logging.getLogger(__name__)
 
+# Pinecone accepts at most 100 vectors per upsert request
+UPSERT_BATCH_SIZE = 100
+UPSERT_POOL_THREADS = 30
+UPSERT_MAX_RETRIES = 3
+
+# Pinecone accepts at most 1000 ids per delete request
+DELETE_BATCH_SIZE = 1000
+
+# Ids per fetch request when confirming Bloom filter hits (ids travel in the query string)
+FETCH_BATCH_SIZE = 100
+
+# OpenAI caps an embeddings request at 2048 inputs; smaller sub-batches run in parallel
+EMBEDDING_SUB_BATCH_SIZE = 256
+EMBEDDING_MAX_WORKERS = 8
+
+# Keep-alive connections shared by every OpenAI call
+HTTP_MAX_CONNECTIONS = 64
+
+# add_documents embeds this many rows at a time while the previous window is upserted
+PIPELINE_WINDOW_SIZE = EMBEDDING_SUB_BATCH_SIZE * EMBEDDING_MAX_WORKERS
+
+# add_documents holds at most this many documents (and their embeddings) in memory
+INGEST_CHUNK_SIZE = PIPELINE_WINDOW_SIZE * 4
+
+# MMR reranking picks top_k results from this many times as many candidates
+MMR_CANDIDATE_FACTOR = 4
+
 @dataclass
 class Document:
     content: str
     metadata: Dict[str, Any]
     doc_id: str
-    embedding: Optional[List[float]] = None
+    embedding: Optional[np.ndarray] = None
+
+class DocumentBatch:
+    """Column-oriented set of documents for bulk ingest.
+
+    Metadata is held in one DataFrame with categorical columns for the
+    low-cardinality fields instead of one dict per chunk, and embeddings in a
+    single float32 matrix. Pinecone vectors are materialized per upsert slice.
+    """
+    
+    CATEGORICAL_COLUMNS = (
+        "document_type", "evidence_level", "specialty", "article_type",
+        "journal", "organization", "source_file", "file_type"
+    )
+    
+    def __init__(
+        self,
+        ids: List[str],
+        contents: List[str],
+        metadata: pd.DataFrame,
+        embeddings: Optional[np.ndarray] = None
+    ):
+        self.ids = ids
+        self.contents = contents
+        self.metadata = metadata
+        self.embeddings = embeddings
+    
+    @classmethod
+    def from_documents(cls, documents: List[Document]) -> "DocumentBatch":
+        metadata = pd.DataFrame([doc.metadata for doc in documents], dtype=object)
+        for column in cls.CATEGORICAL_COLUMNS:
+            if column in metadata.columns:
+                metadata[column] = metadata[column].astype("category")
+        
+        embeddings = None
+        if documents and all(doc.embedding is not None for doc in documents):
+            embeddings = np.stack([doc.embedding for doc in documents]).astype(np.float32, copy=False)
+        
+        return cls(
+            ids=[doc.doc_id for doc in documents],
+            contents=[doc.content for doc in documents],
+            metadata=metadata,
+            embeddings=embeddings
+        )
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def select(self, rows: np.ndarray) -> "DocumentBatch":
+        """Return a new batch holding only the given row positions"""
+        return DocumentBatch(
+            ids=[self.ids[i] for i in rows],
+            contents=[self.contents[i] for i in rows],
+            metadata=self.metadata.iloc[rows].reset_index(drop=True),
+            embeddings=self.embeddings[rows] if self.embeddings is not None else None
+        )
+    
+    def vectors(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Build Pinecone upsert payloads for rows [start, stop)"""
+        rows = self.metadata.iloc[start:stop].to_dict("records")
+        if not len(self.metadata.columns):
+            rows = [{} for _ in self.ids[start:stop]]  # to_dict drops rows when there are no columns
+        vectors = []
+        for offset, row in enumerate(rows):
+            i = start + offset
+            # Columns missing from a document's metadata come back as NaN
+            metadata = {
+                key: value for key, value in row.items()
+                if value is not None and not (isinstance(value, float) and math.isnan(value))
+            }
+            # The text itself lives in the content store; metadata only carries a fingerprint
+            metadata["content_hash"] = ContentStore.content_hash(self.contents[i])
+            vectors.append({
+                "id": self.ids[i],
+                "values": self.embeddings[i].tolist(),
+                "metadata": metadata
+            })
+        return vectors
+
+def _mmr_order(
+    query_embedding: np.ndarray,
+    candidate_embeddings: List[List[float]],
+    top_k: int,
+    mmr_lambda: float
+) -> List[int]:
+    """Pick up to top_k candidate indices by maximal marginal relevance"""
+    candidates = np.ascontiguousarray(candidate_embeddings, dtype=np.float32)
+    candidates /= np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    query = np.array(query_embedding, dtype=np.float32)  # Copy; normalized in place below
+    query /= max(float(np.linalg.norm(query)), 1e-12)
+    
+    # All similarities up front: one GEMV against the query, one GEMM among candidates
+    relevance = candidates @ query
+    pairwise = candidates @ candidates.T
+    
+    selected = []
+    redundancy = np.zeros(len(candidates), dtype=np.float32)  # Max similarity to anything picked
+    available = np.ones(len(candidates), dtype=bool)
+    for _ in range(min(top_k, len(candidates))):
+        scores = mmr_lambda * relevance - (1 - mmr_lambda) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        available[best] = False
+        redundancy = pairwise[best].copy() if not selected else np.maximum(redundancy, pairwise[best])
+        selected.append(best)
+    return selected
 
 class RAGService:
     def __init__(self):
@@ -24,16 +171,48 @@ class RAGService:
         self.pc = None
         self.index = None
         self.index_name = os.getenv("PINECONE_INDEX_NAME", "medical-knowledge")
+        self.embedding_model = "text-embedding-ada-002"
+        self.embedding_dimension = 1536
+        self._embedding_cache = None
+        self._content_store = None
+        self.id_filter_path = os.getenv("INDEXED_IDS_FILTER_PATH", "data/cache/indexed_ids.bloom")
+        self._id_filter = None
+        self.query_cache = SemanticQueryCache(
+            dimension=self.embedding_dimension,
+            semantic=os.getenv("SEMANTIC_QUERY_CACHE", "False").lower() == "true"
+        )
         self._initialized = False
+        self._init_lock = threading.Lock()
+        self._inflight: Dict[tuple, asyncio.Future] = {}  # Lookups in progress, keyed by query and scope
+        
+        # Connect in the background so the first request doesn't pay for client
+        # setup and the index round-trips
+        threading.Thread(target=self._warm_up, name="rag-warm-up", daemon=True).start()
+    
+    def _warm_up(self):
+        try:
+            self._ensure_initialized()
+        except Exception as e:
+            logger.warning(f"Background RAG initialization failed, will retry on first use: {e}")
     
     def _ensure_initialized(self):
         """Initialize clients only when needed"""
-        if not self._initialized:
+        if self._initialized:
+            return
+        
+        # Waits for an in-flight warm-up instead of connecting twice
+        with self._init_lock:
+            if self._initialized:
+                return
+            
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise ValueError("OPENAI_API_KEY environment variable not set")
             
-            self.openai_client = openai.OpenAI(api_key=api_key)
+            # The client retries rate-limit and server errors with exponential backoff
+            self.openai_client = openai.OpenAI(
+                api_key=api_key, max_retries=5, http_client=self._create_http_client()
+            )
             
             pinecone_key = os.getenv("PINECONE_API_KEY")
             if not pinecone_key:
@@ -42,14 +221,37 @@ class RAGService:
             self.pc = Pinecone(api_key=pinecone_key)
             self._initialize_index()
             self._initialized = True
-        self.embedding_model = "text-embedding-ada-002"
-        self.embedding_dimension = 1536
         
+    def _create_http_client(self):
+        """Build one pooled HTTP client for all OpenAI calls, on HTTP/2 when h2 is installed"""
+        http2 = importlib.util.find_spec("h2") is not None
+        if not http2:
+            logger.info("h2 is not installed; OpenAI calls use HTTP/1.1 keep-alive connections")
+        
+        # Enough warm connections for every parallel embedding sub-batch to reuse one
+        return openai.DefaultHttpxClient(
+            http2=http2,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+        )
+    
     def _initialize_index(self):
         """Initialize Pinecone index if it doesn't exist"""
-        self._ensure_initialized()
+        if self.index is not None:
+            return
+        
         try:
-            # Check if index exists
+            # The index usually exists from earlier runs, so connect to it directly
+            # and only fall back to the slower control-plane listing when it is missing
+            try:
+                index = self.pc.Index(self.index_name, pool_threads=UPSERT_POOL_THREADS)
+                index.describe_index_stats()
+                self.index = index
+                logger.info(f"Connected to Pinecone index: {self.index_name}")
+                return
+            except NotFoundException:
+                logger.info(f"Pinecone index {self.index_name} not found")
+            
             existing_indexes = [index.name for index in self.pc.list_indexes()]
             
             if self.index_name not in existing_indexes:
@@ -64,118 +266,390 @@ class RAGService:
                     )
                 )
             
-            self.index = self.pc.Index(self.index_name)
+            # Extra connection threads let add_documents keep many upserts in flight
+            self.index = self.pc.Index(self.index_name, pool_threads=UPSERT_POOL_THREADS)
             logger.info(f"Connected to Pinecone index: {self.index_name}")
             
         except Exception as e:
             logger.error(f"Error initializing Pinecone index: {e}")
             raise
     
-    def create_embedding(self, text: str) -> List[float]:
+    def _get_embedding_cache(self) -> EmbeddingCache:
+        """Open the embedding cache only when needed"""
+        if self._embedding_cache is None:
+            self._embedding_cache = EmbeddingCache(model=self.embedding_model)
+        return self._embedding_cache
+    
+    def _get_content_store(self) -> ContentStore:
+        """Open the chunk text store only when needed"""
+        if self._content_store is None:
+            self._content_store = ContentStore()
+        return self._content_store
+    
+    def get_stored_contents(self, doc_ids: Iterable[str]) -> Dict[str, str]:
+        """Return the chunk text stored for each id that has any"""
+        return self._get_content_store().get_many(doc_ids)
+    
+    def _get_id_filter(self) -> BloomFilter:
+        """Load the filter of ids already in the index, seeding it from Pinecone on first use"""
+        if self._id_filter is None:
+            id_filter = BloomFilter.load(self.id_filter_path)
+            if id_filter is None:
+                id_filter = BloomFilter()
+                try:
+                    # Serverless indexes page through their ids 100 at a time
+                    for page in self.index.list():
+                        for doc_id in page:
+                            id_filter.add(doc_id)
+                except Exception as e:
+                    logger.warning(f"Could not list existing ids from Pinecone: {e}")
+            self._id_filter = id_filter
+        return self._id_filter
+    
+    def _save_id_filter(self):
+        try:
+            self._get_id_filter().save(self.id_filter_path)
+        except OSError as e:
+            logger.warning(f"Could not save indexed id filter: {e}")
+    
+    def create_embedding(self, text: str) -> np.ndarray:
         """Create embedding for a piece of text using OpenAI"""
+        cached = self._get_embedding_cache().get_many([text])
+        if text in cached:
+            return cached[text]
+        
         self._ensure_initialized()
         try:
             response = self.openai_client.embeddings.create(
                 input=text,
                 model=self.embedding_model
             )
-            return response.data[0].embedding
+            embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+            self._get_embedding_cache().put_many([text], [embedding])
+            return embedding
         except Exception as e:
             logger.error(f"Error creating embedding: {e}")
             raise
     
-    def create_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Create embeddings for multiple texts in batch"""
-        self._ensure_initialized()
-        try:
+    def create_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """Create embeddings for multiple texts in batch, one float32 row per text"""
+        # Repeated texts (e.g. templated chunks) are looked up and embedded once,
+        # then scattered back to every position they occur in
+        unique_texts = list(dict.fromkeys(texts))
+        
+        # Texts embedded before (by any ingest or query) come from the cache
+        cache = self._get_embedding_cache()
+        cached = cache.get_many(unique_texts)
+        misses = [text for text in unique_texts if text not in cached]
+        
+        if misses:
+            self._ensure_initialized()
+            try:
+                embeddings = self._embed_in_sub_batches(misses)
+            except Exception as e:
+                logger.error(f"Error creating batch embeddings: {e}")
+                raise
+            
+            cache.put_many(misses, embeddings)
+            cached.update(zip(misses, embeddings))
+        
+        logger.info(
+            f"Embedding cache: {len(unique_texts) - len(misses)} hits, {len(misses)} misses, "
+            f"{len(texts) - len(unique_texts)} duplicates"
+        )
+        if not texts:
+            return np.empty((0, self.embedding_dimension), dtype=np.float32)
+        return np.stack([cached[text] for text in texts])
+    
+    def _embed_in_sub_batches(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in request-sized sub-batches sent concurrently, preserving order"""
+        # Group similar lengths so no request is held up by one long outlier
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        
+        def embed(start: int) -> np.ndarray:
             response = self.openai_client.embeddings.create(
-                input=texts,
+                input=[texts[i] for i in order[start:start + EMBEDDING_SUB_BATCH_SIZE]],
                 model=self.embedding_model
             )
-            return [data.embedding for data in response.data]
-        except Exception as e:
-            logger.error(f"Error creating batch embeddings: {e}")
-            raise
+            return np.asarray([data.embedding for data in response.data], dtype=np.float32)
+        
+        # Sub-batches land straight in their rows of one preallocated matrix
+        starts = range(0, len(texts), EMBEDDING_SUB_BATCH_SIZE)
+        embeddings = np.empty((len(texts), self.embedding_dimension), dtype=np.float32)
+        with ThreadPoolExecutor(max_workers=min(EMBEDDING_MAX_WORKERS, len(starts))) as executor:
+            for start, sub_batch in zip(starts, executor.map(embed, starts)):
+                embeddings[order[start:start + len(sub_batch)]] = sub_batch
+        return embeddings
     
-    def add_documents(self, documents: List[Document]) -> bool:
-        """Add documents to the vector database"""
+    def add_documents(self, documents: Union[Iterable[Document], DocumentBatch]) -> bool:
+        """Add documents to the vector database.
+        
+        Documents are consumed INGEST_CHUNK_SIZE at a time, so a generator can
+        feed a large ingest without every chunk and embedding being held at once.
+        """
         self._ensure_initialized()
+        
+        # Chunk ids are derived from their text, so an indexed id means nothing to
+        # embed or upsert
+        added = skipped = 0
+        attempted = False  # Whether any upsert was started, even if it later failed
         try:
-            # Create embeddings for documents that don't have them
-            texts_to_embed = []
-            doc_indices = []
-            
-            for i, doc in enumerate(documents):
-                if doc.embedding is None:
-                    texts_to_embed.append(doc.content)
-                    doc_indices.append(i)
-            
-            if texts_to_embed:
-                embeddings = self.create_embeddings_batch(texts_to_embed)
-                for i, embedding in enumerate(embeddings):
-                    documents[doc_indices[i]].embedding = embedding
-            
-            # Prepare vectors for Pinecone
-            vectors = []
-            for doc in documents:
-                vectors.append({
-                    "id": doc.doc_id,
-                    "values": doc.embedding,
-                    "metadata": {
-                        **doc.metadata,
-                        "content": doc.content[:1000]  # Store first 1000 chars in metadata
-                    }
-                })
-            
-            # Upsert to Pinecone in batches
-            batch_size = 100
-            for i in range(0, len(vectors), batch_size):
-                batch = vectors[i:i + batch_size]
-                self.index.upsert(vectors=batch)
-            
-            logger.info(f"Successfully added {len(documents)} documents to index")
+            if isinstance(documents, DocumentBatch):
+                new_ids = self._unindexed_ids(documents.ids)
+                rows = np.array([doc_id in new_ids for doc_id in documents.ids], dtype=bool)
+                batch = documents if rows.all() else documents.select(np.flatnonzero(rows))
+                skipped = len(documents) - len(batch)
+                missing = None if batch.embeddings is not None else np.ones(len(batch), dtype=bool)
+                attempted = len(batch) > 0
+                self._add_batch(batch, missing)
+                added = len(batch)
+            else:
+                iterator = iter(documents)
+                while chunk := list(islice(iterator, INGEST_CHUNK_SIZE)):
+                    new_ids = self._unindexed_ids([doc.doc_id for doc in chunk])
+                    new = [doc for doc in chunk if doc.doc_id in new_ids]
+                    skipped += len(chunk) - len(new)
+                    attempted = attempted or len(new) > 0
+                    self._add_batch(*self._prepare_batch(new))
+                    added += len(new)
+            
+            logger.info(f"Successfully added {added} documents to index, skipped {skipped} already indexed")
             return True
             
         except Exception as e:
             logger.error(f"Error adding documents: {e}")
             return False
+        finally:
+            # A batch that failed part-way may still have upserted some of its vectors
+            if attempted:
+                self._save_id_filter()
+                self.query_cache.clear()  # Cached results may now miss the new documents
+    
+    def _unindexed_ids(self, doc_ids: List[str]) -> set:
+        """Return the ids that are not in the index yet.
+        
+        The Bloom filter clears most new ids without a request. Its hits may be
+        false positives, so they are confirmed with Pinecone before being skipped;
+        if that check fails they are treated as new, since re-upserting is harmless.
+        """
+        known_ids = self._get_id_filter()
+        candidates = [doc_id for doc_id in doc_ids if doc_id in known_ids]
+        new_ids = set(doc_ids).difference(candidates)
+        
+        for start in range(0, len(candidates), FETCH_BATCH_SIZE):
+            batch_ids = candidates[start:start + FETCH_BATCH_SIZE]
+            try:
+                indexed = self.index.fetch(ids=batch_ids).vectors
+            except Exception as e:
+                logger.warning(f"Could not confirm {len(batch_ids)} ids with Pinecone, adding them again: {e}")
+                indexed = {}
+            new_ids.update(doc_id for doc_id in batch_ids if doc_id not in indexed)
+        
+        return new_ids
+    
+    def _prepare_batch(self, documents: List[Document]) -> Tuple[DocumentBatch, Optional[np.ndarray]]:
+        """Build a batch plus a mask of the rows that still need embedding (None if none do)"""
+        batch = DocumentBatch.from_documents(documents)
+        missing = None
+        if batch.embeddings is None and len(batch):
+            # Keep embeddings the caller already has; only the rest are created
+            missing = np.array([doc.embedding is None for doc in documents], dtype=bool)
+            batch.embeddings = np.zeros((len(batch), self.embedding_dimension), dtype=np.float32)
+            for i in np.flatnonzero(~missing):
+                batch.embeddings[i] = documents[i].embedding
+        return batch, missing
+    
+    def _add_batch(self, batch: DocumentBatch, missing: Optional[np.ndarray]):
+        if not len(batch):
+            return
+        
+        # Text goes to the local store before its vector becomes searchable
+        self._get_content_store().put_many(batch.ids, batch.contents)
+        
+        try:
+            if missing is None:
+                self._upsert_parallel(batch, 0, len(batch))
+            else:
+                self._embed_and_upsert_pipelined(batch, missing)
+        finally:
+            # Record the whole batch even after a failure: ids whose upsert failed are
+            # only false positives, which _unindexed_ids confirms with Pinecone
+            known_ids = self._get_id_filter()
+            for doc_id in batch.ids:
+                known_ids.add(doc_id)
+    
+    def _embed_and_upsert_pipelined(self, batch: DocumentBatch, missing: np.ndarray):
+        """Embed windows of the batch on a producer thread while this thread upserts finished ones"""
+        if batch.embeddings is None:
+            batch.embeddings = np.zeros((len(batch), self.embedding_dimension), dtype=np.float32)
+        
+        ready = queue.Queue(maxsize=4)
+        stop = threading.Event()
+        
+        def produce():
+            try:
+                for start in range(0, len(batch), PIPELINE_WINDOW_SIZE):
+                    if stop.is_set():
+                        return
+                    stop_row = min(start + PIPELINE_WINDOW_SIZE, len(batch))
+                    rows = np.flatnonzero(missing[start:stop_row]) + start
+                    if len(rows):
+                        batch.embeddings[rows] = self.create_embeddings_batch([batch.contents[i] for i in rows])
+                    ready.put(stop_row)
+            except Exception as e:
+                ready.put(e)
+            finally:
+                ready.put(None)
+        
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        finished = False  # Whether the producer's None sentinel has been consumed
+        try:
+            # Upsert whole 100-row slices as embeddings land; the tail goes out at the end
+            upserted = 0
+            while (item := ready.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                aligned = upserted + (item - upserted) // UPSERT_BATCH_SIZE * UPSERT_BATCH_SIZE
+                self._upsert_parallel(batch, upserted, aligned)
+                upserted = aligned
+            finished = True
+            self._upsert_parallel(batch, upserted, len(batch))
+        except Exception:
+            stop.set()
+            if not finished:
+                while ready.get() is not None:  # Unblock the producer so it can exit
+                    pass
+            raise
+        finally:
+            producer.join()
+    
+    def _upsert_parallel(self, batch: DocumentBatch, start: int, stop: int):
+        """Upsert rows [start, stop) in concurrent slices, retrying failed slices with backoff"""
+        pending = list(range(start, stop, UPSERT_BATCH_SIZE))
+        for attempt in range(UPSERT_MAX_RETRIES + 1):
+            in_flight = [
+                (slice_start, self.index.upsert(
+                    vectors=batch.vectors(slice_start, min(slice_start + UPSERT_BATCH_SIZE, stop)),
+                    async_req=True
+                ))
+                for slice_start in pending
+            ]
+            
+            # Join every request before retrying or raising, so none is left in flight
+            failed = []
+            last_error = None
+            for slice_start, request in in_flight:
+                try:
+                    request.get()
+                except Exception as e:
+                    logger.warning(f"Upsert of rows {slice_start}-{slice_start + UPSERT_BATCH_SIZE} failed: {e}")
+                    failed.append(slice_start)
+                    last_error = e
+            
+            if not failed:
+                return
+            if attempt == UPSERT_MAX_RETRIES:
+                raise last_error
+            pending = failed
+            time.sleep(0.5 * 2 ** attempt)
     
     def retrieve_relevant_docs(
         self, 
         query: str, 
         top_k: int = 5,
-        filter_dict: Optional[Dict[str, Any]] = None
+        filter_dict: Optional[Dict[str, Any]] = None,
+        mmr_lambda: Optional[float] = None
     ) -> List[Dict[str, Any]]:
-        """Retrieve relevant documents for a query"""
+        """Retrieve relevant documents for a query.
+        
+        With ``mmr_lambda`` set, a larger candidate pool is reranked locally by
+        maximal marginal relevance so near-duplicate chunks don't crowd out
+        other sources (1.0 = pure relevance, lower = more diverse).
+        """
+        # Repeated (or, if enabled, reworded) queries reuse a recent result without a Pinecone round-trip
+        scope = SemanticQueryCache.scope_for(top_k, filter_dict, mmr_lambda)
+        cached_results = self.query_cache.get_exact(query, scope)
+        if cached_results is not None:
+            return cached_results
+        
         self._ensure_initialized()
         try:
             # Create embedding for query
             query_embedding = self.create_embedding(query)
             
+            cached_results = self.query_cache.get_similar(query_embedding, scope)
+            if cached_results is not None:
+                return cached_results
+            
             # Search in Pinecone
+            rerank = mmr_lambda is not None
             search_response = self.index.query(
-                vector=query_embedding,
-                top_k=top_k,
+                vector=query_embedding.tolist(),
+                top_k=top_k * MMR_CANDIDATE_FACTOR if rerank else top_k,
                 include_metadata=True,
+                include_values=rerank,
                 filter=filter_dict
             )
+            matches = search_response.matches
+            if rerank and matches:
+                order = _mmr_order(
+                    query_embedding, [match.values for match in matches], top_k, mmr_lambda
+                )
+                matches = [matches[i] for i in order]
+            
+            # Join chunk text back in with one lookup; vectors upserted before the
+            # content store existed still carry their text in metadata
+            contents = self._get_content_store().get_many(match.id for match in matches)
             
             # Format results
-            results = []
-            for match in search_response.matches:
-                results.append({
+            get_content = contents.get
+            results = [
+                {
                     "id": match.id,
                     "score": match.score,
-                    "content": match.metadata.get("content", ""),
+                    "content": get_content(match.id) or match.metadata.get("content", ""),
                     "metadata": match.metadata
-                })
+                }
+                for match in matches
+            ]
             
+            self.query_cache.put(query, scope, query_embedding, results)
             return results
             
         except Exception as e:
             logger.error(f"Error retrieving documents: {e}")
             return []
     
+    async def retrieve_relevant_docs_async(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        mmr_lambda: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Retrieve relevant documents without blocking the event loop.
+        
+        Concurrent calls for the same query and search parameters share one
+        in-flight lookup instead of each embedding and querying separately.
+        """
+        key = (
+            SemanticQueryCache.normalize_query(query),
+            SemanticQueryCache.scope_for(top_k, filter_dict, mmr_lambda)
+        )
+        
+        # No await between the check and the insert, so this is atomic on the loop
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(asyncio.to_thread(
+                self.retrieve_relevant_docs, query, top_k, filter_dict, mmr_lambda
+            ))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shield the shared lookup so one cancelled caller doesn't cancel it for the rest
+        return list(await asyncio.shield(inflight))
+    
     def get_index_stats(self) -> Dict[str, Any]:
         """Get statistics about the index"""
         self._ensure_initialized()
@@ -190,12 +664,44 @@ class RAGService:
             logger.error(f"Error getting index stats: {e}")
             return {}
     
+    async def get_index_stats_async(self) -> Dict[str, Any]:
+        """Get index statistics without blocking the event loop"""
+        return await asyncio.to_thread(self.get_index_stats)
+    
     def delete_documents(self, doc_ids: List[str]) -> bool:
         """Delete documents from the index"""
+        self._ensure_initialized()
         try:
-            self.index.delete(ids=doc_ids)
+            # Send every id slice at once on the index's connection pool, then wait for all
+            in_flight = [
+                self.index.delete(ids=doc_ids[start:start + DELETE_BATCH_SIZE], async_req=True)
+                for start in range(0, len(doc_ids), DELETE_BATCH_SIZE)
+            ]
+            for request in in_flight:
+                request.get()
+            self._get_content_store().delete_many(doc_ids)
+            if doc_ids:
+                self._invalidate_id_filter()
             logger.info(f"Deleted {len(doc_ids)} documents from index")
             return True
         except Exception as e:
             logger.error(f"Error deleting documents: {e}")
-            return False
\ No newline at end of file
+            return False
+        finally:
+            # Some slices may have gone through even if another failed
+            if doc_ids:
+                self.query_cache.clear()
+    
+    def _invalidate_id_filter(self):
+        """Bloom filters can't forget ids; drop it so it is reseeded from the index.
+        
+        Only needed after a delete succeeds: ids left behind by a failed one are
+        false positives, which _unindexed_ids confirms with Pinecone anyway.
+        """
+        self._id_filter = None
+        try:
+            os.remove(self.id_filter_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove indexed id filter: {e}")
\ No newline at end of file
@@ -17,18 +17,6 @@ async def test_rag_system():
     print("\n2. Testing document retrieval...")
     rag_service = processor.rag_service
     
-    # Get index stats
-    stats = rag_service.get_index_stats()
-    print(f"Index stats: {stats}")
-    
-    # Test search
-    results = rag_service.retrieve_relevant_docs("chest pain management", top_k=3)
-    print(f"Found {len(results)} relevant documents for 'chest pain management'")
-    for i, result in enumerate(results):
-        print(f"  {i+1}. Score: {result['score']:.3f} - {result['content'][:100]}...")
-    
-    # 3. Test clinical AI
-    print("\n3. Testing clinical AI service...")
     ai_service = ClinicalAIService()
     
     # Create test query
@@ -42,8 +30,31 @@ async def test_rag_system():
         )
     )
     
-    try:
-        response = ai_service.process_clinical_query(test_query)
+    # Stats, search and the clinical query are independent, so run them concurrently
+    stats, results, response = await asyncio.gather(
+        rag_service.get_index_stats_async(),
+        rag_service.retrieve_relevant_docs_async("chest pain management", top_k=3),
+        asyncio.to_thread(ai_service.process_clinical_query, test_query),
+        return_exceptions=True
+    )
+    
+    if isinstance(stats, BaseException):
+        print(f"Error getting index stats: {stats}")
+    else:
+        print(f"Index stats: {stats}")
+    
+    if isinstance(results, BaseException):
+        print(f"Error searching documents: {results}")
+    else:
+        print(f"Found {len(results)} relevant documents for 'chest pain management'")
+        for i, result in enumerate(results):
+            print(f"  {i+1}. Score: {result['score']:.3f} - {result['content'][:100]}...")
+    
+    # 3. Test clinical AI
+    print("\n3. Testing clinical AI service...")
+    if isinstance(response, BaseException):
+        print(f"Error testing AI service: {response}")
+    else:
         print(f"AI Response generated successfully!")
         print(f"Query ID: {response.query_id}")
         print(f"Processing time: {response.processing_time_ms:.2f}ms")
@@ -53,9 +64,6 @@ async def test_rag_system():
             rec = response.recommendations[0]
             print(f"First recommendation: {rec.recommendation[:200]}...")
             print(f"Confidence: {rec.confidence_score}")
-            
-    except Exception as e:
-        print(f"Error testing AI service: {e}")
 
 if __name__ == "__main__":
     asyncio.run(test_rag_system())
\ No newline at end of file
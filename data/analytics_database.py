@@ -4,12 +4,17 @@ Comprehensive mock analytics data for Clinical Decision Support System
 Includes usage metrics, clinical outcomes, user behavior, and quality indicators
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-import random
+import numpy as np
+import pandas as pd
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from collections import Counter, defaultdict
 from enum import Enum
+from statistics import fmean
 import json
+import sys
 
 class UserRole(Enum):
     PHYSICIAN = "physician"
@@ -37,7 +42,17 @@ class Specialty(Enum):
     FAMILY_MEDICINE = "family_medicine"
     PEDIATRICS = "pediatrics"
 
-@dataclass
+OUTCOME_VALUES = ["improved", "unchanged", "declined"]
+
+# Enum values by position, so histograms over index columns map straight back to keys
+_ROLE_VALUES = [sys.intern(role.value) for role in UserRole]
+_SPECIALTY_VALUES = [sys.intern(specialty.value) for specialty in Specialty]
+_QUERY_TYPE_VALUES = [sys.intern(query_type.value) for query_type in QueryType]
+
+# Confidence scores are stored as uint8 multiples of 1 / CONFIDENCE_SCALE
+CONFIDENCE_SCALE = 255
+
+@dataclass(slots=True, frozen=True)
 class ClinicalQueryLog:
     query_id: str
     user_id: str
@@ -55,7 +70,7 @@ class ClinicalQueryLog:
     clinical_outcome: Optional[str]  # "improved", "unchanged", "declined"
     session_id: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserActivityMetrics:
     user_id: str
     user_role: UserRole
@@ -68,7 +83,7 @@ class UserActivityMetrics:
     training_completion_rate: float
     avg_feedback_rating: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SystemPerformanceMetrics:
     date: datetime
     total_queries: int
@@ -79,7 +94,7 @@ class SystemPerformanceMetrics:
     database_query_time_ms: float
     ai_processing_time_ms: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ClinicalOutcomeMetrics:
     date: datetime
     specialty: Specialty
@@ -91,24 +106,93 @@ class ClinicalOutcomeMetrics:
     avg_confidence_score: float
     drug_interactions_prevented: int
 
+def _reduce_by_group(
+    group_idx: np.ndarray, n_groups: int, *values: np.ndarray
+) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Count rows and sum each value column per group index, one bincount per column"""
+    counts = np.bincount(group_idx, minlength=n_groups)[:n_groups]
+    sums = [np.bincount(group_idx, weights=column, minlength=n_groups)[:n_groups] for column in values]
+    return counts, sums
+
 class AnalyticsDatabase:
     """Mock analytics database for Clinical Decision Support System"""
     
-    def __init__(self):
+    def __init__(self, seed: int = 0):
         self.start_date = datetime.now() - timedelta(days=90)  # 90 days of data
         self.end_date = datetime.now()
         
-        # Generate mock data
-        self.query_logs = self._generate_query_logs()
-        self.user_metrics = self._generate_user_metrics()
-        self.performance_metrics = self._generate_performance_metrics()
-        self.outcome_metrics = self._generate_outcome_metrics()
-        self.specialty_usage = self._calculate_specialty_usage()
-        self.quality_metrics = self._calculate_quality_metrics()
+        # One seed for the whole dataset, split into an independent stream per generator
+        # so the data doesn't depend on which lazy property happens to be built first
+        log_seed, user_seed, performance_seed = np.random.SeedSequence(seed).spawn(3)
+        self._rngs = {
+            "query_logs": np.random.default_rng(log_seed),
+            "users": np.random.default_rng(user_seed),
+            "performance": np.random.default_rng(performance_seed)
+        }
     
-    def _generate_query_logs(self) -> List[ClinicalQueryLog]:
-        """Generate realistic clinical query log data"""
-        logs = []
+    # Mock data is generated on first access, so importing the module stays cheap
+    @cached_property
+    def _query_data(self) -> Tuple[List[ClinicalQueryLog], Dict[str, np.ndarray]]:
+        return self._generate_query_logs()
+    
+    @property
+    def query_logs(self) -> List[ClinicalQueryLog]:
+        return self._query_data[0]
+    
+    @property
+    def _log_columns(self) -> Dict[str, np.ndarray]:
+        """Columns of the log fields used by the aggregate metrics, in log (time) order"""
+        return self._query_data[1]
+    
+    @cached_property
+    def _log_masks(self) -> Dict[str, np.ndarray]:
+        """Which logs recorded each optional field, computed once for every aggregation"""
+        columns = self._log_columns
+        return {
+            "followed": ~np.isnan(columns["followed"]),
+            "outcome": columns["outcome"] >= 0,
+            "rated": columns["rating"] > 0
+        }
+    
+    @cached_property
+    def query_logs_df(self) -> pd.DataFrame:
+        """The log columns as one DataFrame, for grouped aggregations"""
+        return pd.DataFrame(self._log_columns)
+    
+    @cached_property
+    def user_metrics(self) -> List[UserActivityMetrics]:
+        return self._generate_user_metrics()
+    
+    @cached_property
+    def performance_metrics(self) -> List[SystemPerformanceMetrics]:
+        return self._generate_performance_metrics()
+    
+    @cached_property
+    def _daily_performance(self) -> Dict[str, np.ndarray]:
+        """Daily performance series as columns for the dashboard averages"""
+        metrics = self.performance_metrics
+        return {
+            "uptime": np.array([m.system_uptime_percentage for m in metrics]),
+            "error_rate": np.array([m.error_rate_percentage for m in metrics]),
+            "response_time": np.array([m.avg_response_time_ms for m in metrics]),
+            "peak_users": np.array([m.peak_concurrent_users for m in metrics])
+        }
+    
+    @cached_property
+    def outcome_metrics(self) -> List[ClinicalOutcomeMetrics]:
+        return self._generate_outcome_metrics()
+    
+    @cached_property
+    def specialty_usage(self) -> Dict[str, Any]:
+        return self._calculate_specialty_usage()
+    
+    @cached_property
+    def quality_metrics(self) -> Dict[str, Any]:
+        return self._calculate_quality_metrics()
+    
+    def _generate_query_logs(self) -> Tuple[List[ClinicalQueryLog], Dict[str, np.ndarray]]:
+        """Generate realistic clinical query log data, plus numeric columns of it"""
+        rng = self._rngs["query_logs"]
         
         # Common clinical queries by specialty
         query_templates = {
@@ -154,132 +238,196 @@ class AnalyticsDatabase:
             ]
         }
         
-        # Generate 5000 queries over 90 days
-        for day in range(90):
-            date = self.start_date + timedelta(days=day)
-            
-            # More queries on weekdays, fewer on weekends
-            if date.weekday() < 5:  # Weekday
-                daily_queries = random.randint(45, 75)
-            else:  # Weekend
-                daily_queries = random.randint(20, 35)
-            
-            for _ in range(daily_queries):
-                specialty = random.choice(list(Specialty))
-                user_role = random.choice(list(UserRole))
-                
-                # Physicians and residents make more complex queries
-                if user_role in [UserRole.PHYSICIAN, UserRole.RESIDENT]:
-                    query_type = random.choice(list(QueryType))
-                    confidence_score = random.uniform(0.75, 0.95)
-                else:
-                    query_type = random.choice([QueryType.DRUG_INTERACTION, QueryType.DOSING, QueryType.MONITORING])
-                    confidence_score = random.uniform(0.65, 0.85)
-                
-                # Generate query text
-                if specialty in query_templates:
-                    template = random.choice(query_templates[specialty])
-                    age_group = random.choice(["pediatric", "adult", "elderly"])
-                    query_text = template.format(age_group=age_group)
-                else:
-                    query_text = f"Clinical guidance for {specialty.value} case"
-                
-                # Simulate processing time (faster for simpler queries)
-                if query_type == QueryType.DRUG_INTERACTION:
-                    processing_time = random.uniform(800, 1500)
-                else:
-                    processing_time = random.uniform(1500, 3500)
-                
-                # User feedback (80% provide feedback)
-                feedback_rating = None
-                if random.random() < 0.8:
-                    # Higher ratings for higher confidence
-                    if confidence_score > 0.9:
-                        feedback_rating = random.choices([4, 5], weights=[30, 70])[0]
-                    elif confidence_score > 0.8:
-                        feedback_rating = random.choices([3, 4, 5], weights=[20, 40, 40])[0]
-                    else:
-                        feedback_rating = random.choices([2, 3, 4], weights=[30, 50, 20])[0]
-                
-                # Recommendation following (70% follow recommendations)
-                recommendation_followed = None
-                if random.random() < 0.7:
-                    recommendation_followed = random.choices([True, False], weights=[85, 15])[0]
-                
-                # Clinical outcomes (60% have recorded outcomes)
-                clinical_outcome = None
-                if recommendation_followed and random.random() < 0.6:
-                    clinical_outcome = random.choices(
-                        ["improved", "unchanged", "declined"], 
-                        weights=[75, 20, 5]
-                    )[0]
-                
-                log = ClinicalQueryLog(
-                    query_id=f"q_{len(logs)+1:06d}",
-                    user_id=f"user_{random.randint(1, 150):03d}",
-                    user_role=user_role,
-                    specialty=specialty,
-                    timestamp=date + timedelta(
-                        hours=random.randint(6, 22),
-                        minutes=random.randint(0, 59)
-                    ),
-                    query_text=query_text,
-                    query_type=query_type,
-                    processing_time_ms=processing_time,
-                    confidence_score=confidence_score,
-                    recommendations_count=random.randint(1, 4),
-                    user_feedback_rating=feedback_rating,
-                    recommendation_followed=recommendation_followed,
-                    patient_age_group=random.choice(["pediatric", "adult", "geriatric"]),
-                    clinical_outcome=clinical_outcome,
-                    session_id=f"session_{random.randint(1, 1000):04d}"
-                )
-                logs.append(log)
-        
-        return logs
+        specialties = list(Specialty)
+        roles = list(UserRole)
+        query_types = list(QueryType)
+        template_age_groups = ["pediatric", "adult", "elderly"]
+        patient_age_groups = ["pediatric", "adult", "geriatric"]
+        
+        # Every possible query text, formatted once: [specialty][template][age group]
+        query_texts = [
+            [[template.format(age_group=age_group) for age_group in template_age_groups]
+             for template in query_templates[specialty]]
+            if specialty in query_templates
+            else [[f"Clinical guidance for {specialty.value} case"] * len(template_age_groups)]
+            for specialty in specialties
+        ]
+        
+        # Roughly 5000 queries over 90 days: more on weekdays, fewer on weekends
+        dates = [self.start_date + timedelta(days=day) for day in range(90)]
+        is_weekday = np.array([date.weekday() < 5 for date in dates])
+        daily_queries = np.where(is_weekday, rng.integers(45, 76, size=90), rng.integers(20, 36, size=90))
+        day = np.repeat(np.arange(90), daily_queries)
+        n = len(day)
+        
+        # Draw every field for all queries at once, one column per field
+        specialty_idx = rng.integers(0, len(specialties), size=n)
+        role_idx = rng.integers(0, len(roles), size=n)
+        
+        # Physicians and residents make more complex queries
+        is_senior = np.isin(role_idx, [roles.index(UserRole.PHYSICIAN), roles.index(UserRole.RESIDENT)])
+        simple_types = np.array([query_types.index(query_type) for query_type in
+                                 (QueryType.DRUG_INTERACTION, QueryType.DOSING, QueryType.MONITORING)])
+        query_type_idx = np.where(
+            is_senior,
+            rng.integers(0, len(query_types), size=n),
+            simple_types[rng.integers(0, len(simple_types), size=n)]
+        )
+        confidence = np.where(is_senior, rng.uniform(0.75, 0.95, size=n), rng.uniform(0.65, 0.85, size=n))
+        
+        # Generate query text
+        # Each query picks among its own specialty's templates; specialties without
+        # templates have the single fallback text
+        template_counts = np.array([len(texts) for texts in query_texts])
+        template_idx = rng.integers(0, template_counts[specialty_idx])
+        age_group_idx = rng.integers(0, len(template_age_groups), size=n)
+        
+        # Simulate processing time (faster for simpler queries)
+        is_interaction = query_type_idx == query_types.index(QueryType.DRUG_INTERACTION)
+        processing_time = np.where(is_interaction, rng.uniform(800, 1500, size=n), rng.uniform(1500, 3500, size=n))
+        
+        # User feedback (80% provide feedback), higher ratings for higher confidence; 0 = no feedback
+        # Each confidence band (>0.9, >0.8, rest) samples its ratings from one row of a
+        # cumulative table, so every log needs a single uniform draw
+        has_feedback = rng.random(n) < 0.8
+        rating_values = np.array([[4, 5, 5], [3, 4, 5], [2, 3, 4]], dtype=np.uint8)
+        rating_cdf = np.cumsum([[0.3, 0.7, 0.0], [0.2, 0.4, 0.4], [0.3, 0.5, 0.2]], axis=1)
+        band = 2 - (confidence > 0.8) - (confidence > 0.9)
+        pick = (rng.random(n)[:, None] >= rating_cdf[band]).sum(axis=1)
+        feedback_rating = np.where(has_feedback, rating_values[band, pick], 0)
+        
+        # Recommendation following (70% record it, 85% of those follow)
+        has_followed = rng.random(n) < 0.7
+        followed = rng.random(n) < 0.85
+        
+        # Clinical outcomes (60% of followed recommendations have one); -1 = none
+        outcome_idx = rng.choice(len(OUTCOME_VALUES), size=n, p=[0.75, 0.20, 0.05])
+        outcome_idx[~(has_followed & followed & (rng.random(n) < 0.6))] = -1
+        
+        minute_of_day = rng.integers(6, 23, size=n) * 60 + rng.integers(0, 60, size=n)
+        
+        # Every field is drawn independently, so sorting the times within each day
+        # puts the logs in time order without reshuffling the other columns
+        minute_of_day = minute_of_day[np.lexsort((minute_of_day, day))]
+        user_num = rng.integers(1, 151, size=n)
+        recommendations_count = rng.integers(1, 5, size=n)
+        patient_age_idx = rng.integers(0, len(patient_age_groups), size=n)
+        session_num = rng.integers(1, 1001, size=n)
+        
+        # Keep the fields the aggregate metrics need as compact columns. Confidence is
+        # quantized to uint8 steps of 1/CONFIDENCE_SCALE, with the high-confidence flag
+        # taken before rounding; a rating of 0 means no feedback
+        columns = {
+            "timestamp": (
+                np.datetime64(self.start_date, "us")
+                + day.astype("timedelta64[D]")
+                + minute_of_day.astype("timedelta64[m]")
+            ),
+            "confidence": np.rint(confidence * CONFIDENCE_SCALE).astype(np.uint8),
+            "high_confidence": confidence >= 0.9,
+            "processing_time": processing_time.astype(np.float32),
+            "rating": feedback_rating.astype(np.uint8),
+            "followed": np.where(has_followed, followed, np.nan).astype(np.float32),
+            "outcome": outcome_idx.astype(np.int8),  # Index into OUTCOME_VALUES, -1 = none
+            "specialty": specialty_idx.astype(np.uint8),
+            "user": user_num.astype(np.int16),
+            "role": role_idx.astype(np.uint8),
+            "query_type": query_type_idx.astype(np.uint8)
+        }
+        
+        # Materialize the records once, from plain Python values
+        logs = []
+        for i, (d, s, r, qt, conf, t, a, proc, rating, has_f, f, o, minute, u, rc, pa, sess) in enumerate(zip(
+            day.tolist(), specialty_idx.tolist(), role_idx.tolist(), query_type_idx.tolist(),
+            confidence.tolist(), template_idx.tolist(), age_group_idx.tolist(), processing_time.tolist(),
+            feedback_rating.tolist(), has_followed.tolist(), followed.tolist(), outcome_idx.tolist(),
+            minute_of_day.tolist(), user_num.tolist(), recommendations_count.tolist(),
+            patient_age_idx.tolist(), session_num.tolist()
+        )):
+            logs.append(ClinicalQueryLog(
+                query_id=f"q_{i + 1:06d}",
+                user_id=f"user_{u:03d}",
+                user_role=roles[r],
+                specialty=specialties[s],
+                timestamp=dates[d] + timedelta(minutes=minute),
+                query_text=query_texts[s][t][a],
+                query_type=query_types[qt],
+                processing_time_ms=proc,
+                confidence_score=conf,
+                recommendations_count=rc,
+                user_feedback_rating=rating or None,
+                recommendation_followed=f if has_f else None,
+                patient_age_group=patient_age_groups[pa],
+                clinical_outcome=OUTCOME_VALUES[o] if o >= 0 else None,
+                session_id=f"session_{sess:04d}"
+            ))
+        
+        return logs, columns
     
     def _generate_user_metrics(self) -> List[UserActivityMetrics]:
         """Generate user activity and engagement metrics"""
+        rng = self._rngs["users"]
         metrics = []
         
+        # Bucket logs by user once instead of rescanning every log per user
+        queries_by_user = defaultdict(list)
+        for log in self.query_logs:
+            queries_by_user[log.user_id].append(log)
+        
+        # Draw every user's profile up front
+        roles = list(UserRole)
+        specialties = list(Specialty)
+        role_idx = rng.integers(0, len(roles), size=150)
+        specialty_idx = rng.integers(0, len(specialties), size=150)
+        
+        # Session duration varies by role
+        session_duration = np.select(
+            [role_idx == roles.index(UserRole.PHYSICIAN), role_idx == roles.index(UserRole.RESIDENT)],
+            [rng.uniform(25, 45, size=150), rng.uniform(35, 55, size=150)],
+            rng.uniform(15, 30, size=150)
+        )
+        
+        # Training completion varies by role
+        training_completion = np.where(
+            np.isin(role_idx, [roles.index(UserRole.PHYSICIAN), roles.index(UserRole.PHARMACIST)]),
+            rng.uniform(0.85, 1.0, size=150),
+            rng.uniform(0.65, 0.95, size=150)
+        )
+        
+        # Certification status
+        cert_values = ["certified", "pending", "expired"]
+        cert_idx = rng.choice(len(cert_values), size=150, p=[0.80, 0.15, 0.05])
+        
         # Generate for 150 users across different roles
-        for user_id in range(1, 151):
-            user_role = random.choice(list(UserRole))
-            specialty = random.choice(list(Specialty))
+        for user_id, r, sp, duration, training, cert in zip(
+            range(1, 151), role_idx.tolist(), specialty_idx.tolist(),
+            session_duration.tolist(), training_completion.tolist(), cert_idx.tolist()
+        ):
+            user_role = roles[r]
+            specialty = specialties[sp]
             
             # Calculate user-specific metrics from query logs
-            user_queries = [log for log in self.query_logs if log.user_id == f"user_{user_id:03d}"]
+            user_queries = queries_by_user.get(f"user_{user_id:03d}", [])
             
             if user_queries:
+                # Active days, feedback and last activity in a single pass
+                active_days = set()
+                rating_total = rating_count = 0
+                last_active = user_queries[0].timestamp
+                for log in user_queries:
+                    active_days.add(log.timestamp.date())
+                    if log.user_feedback_rating:
+                        rating_total += log.user_feedback_rating
+                        rating_count += 1
+                    if log.timestamp > last_active:
+                        last_active = log.timestamp
+                
                 total_queries = len(user_queries)
-                days_active = len(set(log.timestamp.date() for log in user_queries))
+                days_active = len(active_days)
                 avg_queries_per_day = total_queries / max(days_active, 1)
                 
-                # Session duration varies by role
-                if user_role == UserRole.PHYSICIAN:
-                    avg_session_duration = random.uniform(25, 45)
-                elif user_role == UserRole.RESIDENT:
-                    avg_session_duration = random.uniform(35, 55)
-                else:
-                    avg_session_duration = random.uniform(15, 30)
-                
-                # Training completion varies by role
-                if user_role in [UserRole.PHYSICIAN, UserRole.PHARMACIST]:
-                    training_completion = random.uniform(0.85, 1.0)
-                else:
-                    training_completion = random.uniform(0.65, 0.95)
-                
                 # Feedback ratings
-                ratings = [log.user_feedback_rating for log in user_queries if log.user_feedback_rating]
-                avg_feedback = sum(ratings) / len(ratings) if ratings else 0
-                
-                last_active = max(log.timestamp for log in user_queries)
-                
-                # Certification status
-                cert_status = random.choices(
-                    ["certified", "pending", "expired"],
-                    weights=[80, 15, 5]
-                )[0]
+                avg_feedback = rating_total / rating_count if rating_count else 0
                 
                 metrics.append(UserActivityMetrics(
                     user_id=f"user_{user_id:03d}",
@@ -287,10 +435,10 @@ class AnalyticsDatabase:
                     specialty=specialty,
                     total_queries=total_queries,
                     avg_queries_per_day=avg_queries_per_day,
-                    avg_session_duration_minutes=avg_session_duration,
+                    avg_session_duration_minutes=duration,
                     last_active=last_active,
-                    certification_status=cert_status,
-                    training_completion_rate=training_completion,
+                    certification_status=cert_values[cert],
+                    training_completion_rate=training,
                     avg_feedback_rating=avg_feedback
                 ))
         
@@ -298,38 +446,49 @@ class AnalyticsDatabase:
     
     def _generate_performance_metrics(self) -> List[SystemPerformanceMetrics]:
         """Generate system performance metrics"""
+        rng = self._rngs["performance"]
         metrics = []
         
-        for day in range(90):
-            date = self.start_date + timedelta(days=day)
-            
-            # Get daily query count
-            daily_queries = [log for log in self.query_logs if log.timestamp.date() == date.date()]
-            total_queries = len(daily_queries)
+        # Query count and total processing time per calendar day since the start date
+        columns = self._log_columns
+        first_day = np.datetime64(self.start_date.date(), "D")
+        calendar_day = (columns["timestamp"].astype("datetime64[D]") - first_day).astype(np.intp)
+        daily_counts, (daily_processing_time,) = _reduce_by_group(
+            calendar_day, 90, columns["processing_time"]
+        )
+        
+        # System performance varies slightly; draw all 90 days at once
+        dates = [self.start_date + timedelta(days=day) for day in range(90)]
+        is_weekday = np.array([date.weekday() < 5 for date in dates])
+        uptime = rng.uniform(99.5, 99.99, size=90)
+        error_rate = rng.uniform(0.01, 0.5, size=90)
+        peak_users = np.where(is_weekday, rng.integers(15, 46, size=90), rng.integers(8, 21, size=90))
+        
+        # Database and AI processing times (the AI fallback covers days without queries)
+        db_time = rng.uniform(50, 200, size=90)
+        fallback_ai_time = rng.uniform(800, 2000, size=90)
+        
+        for date, total_queries, total_processing_time, up, err, peak, db, fallback in zip(
+            dates, daily_counts.tolist(), daily_processing_time.tolist(), uptime.tolist(),
+            error_rate.tolist(), peak_users.tolist(), db_time.tolist(), fallback_ai_time.tolist()
+        ):
             
             # Calculate average response time
-            if daily_queries:
-                avg_response_time = sum(log.processing_time_ms for log in daily_queries) / len(daily_queries)
+            if total_queries:
+                avg_response_time = total_processing_time / total_queries
             else:
                 avg_response_time = 0
             
-            # System performance varies slightly
-            uptime = random.uniform(99.5, 99.99)
-            error_rate = random.uniform(0.01, 0.5)
-            peak_users = random.randint(15, 45) if date.weekday() < 5 else random.randint(8, 20)
-            
-            # Database and AI processing times
-            db_time = random.uniform(50, 200)
-            ai_time = avg_response_time - db_time if avg_response_time > db_time else random.uniform(800, 2000)
+            ai_time = avg_response_time - db if avg_response_time > db else fallback
             
             metrics.append(SystemPerformanceMetrics(
                 date=date,
                 total_queries=total_queries,
                 avg_response_time_ms=avg_response_time,
-                system_uptime_percentage=uptime,
-                error_rate_percentage=error_rate,
-                peak_concurrent_users=peak_users,
-                database_query_time_ms=db_time,
+                system_uptime_percentage=up,
+                error_rate_percentage=err,
+                peak_concurrent_users=peak,
+                database_query_time_ms=db,
                 ai_processing_time_ms=ai_time
             ))
         
@@ -339,155 +498,150 @@ class AnalyticsDatabase:
         """Generate clinical outcome metrics by specialty"""
         metrics = []
         
-        for specialty in Specialty:
-            for day in range(0, 90, 7):  # Weekly metrics
-                date = self.start_date + timedelta(days=day)
-                
-                # Get specialty queries for the week
-                week_end = date + timedelta(days=6)
-                specialty_queries = [
-                    log for log in self.query_logs
-                    if log.specialty == specialty
-                    and date <= log.timestamp <= week_end
-                    and log.recommendation_followed is not None
-                ]
-                
-                if specialty_queries:
-                    total_recommendations = len(specialty_queries)
-                    recommendations_followed = sum(1 for log in specialty_queries if log.recommendation_followed)
-                    
-                    # Count outcomes
-                    outcomes = [log.clinical_outcome for log in specialty_queries if log.clinical_outcome]
-                    positive_outcomes = sum(1 for outcome in outcomes if outcome == "improved")
-                    neutral_outcomes = sum(1 for outcome in outcomes if outcome == "unchanged")
-                    negative_outcomes = sum(1 for outcome in outcomes if outcome == "declined")
-                    
-                    # Average confidence
-                    avg_confidence = sum(log.confidence_score for log in specialty_queries) / len(specialty_queries)
-                    
-                    # Drug interactions prevented (estimate)
-                    drug_interaction_queries = [
-                        log for log in specialty_queries 
-                        if log.query_type == QueryType.DRUG_INTERACTION
-                    ]
-                    interactions_prevented = int(len(drug_interaction_queries) * 0.3)  # 30% had interactions
-                    
+        # Reduce logs with a recorded follow-up per (specialty, week) group
+        columns = self._log_columns
+        week_length, window = np.timedelta64(7, "D"), np.timedelta64(6, "D")
+        elapsed = columns["timestamp"] - np.datetime64(self.start_date, "us")
+        # Each week's window is [start, start + 6 days] inclusive, as in the per-week
+        # scan, so logs after midnight on a week's seventh day belong to no week
+        recorded = self._log_masks["followed"] & (elapsed % week_length <= window)
+        week = elapsed[recorded] // week_length
+        weeks = len(range(0, 90, 7))
+        group = columns["specialty"][recorded].astype(np.intp) * weeks + week.astype(np.intp)
+        outcome = columns["outcome"][recorded]
+        counts, sums = _reduce_by_group(
+            group, len(Specialty) * weeks,
+            columns["followed"][recorded],
+            outcome == OUTCOME_VALUES.index("improved"),
+            outcome == OUTCOME_VALUES.index("unchanged"),
+            outcome == OUTCOME_VALUES.index("declined"),
+            columns["confidence"][recorded],
+            columns["query_type"][recorded] == list(QueryType).index(QueryType.DRUG_INTERACTION)
+        )
+        counts = counts.tolist()
+        followed, positive, neutral, negative, confidence_sum, interactions = (
+            column.tolist() for column in sums
+        )
+        
+        for i, specialty in enumerate(Specialty):
+            for week, day in enumerate(range(0, 90, 7)):  # Weekly metrics
+                g = i * weeks + week
+                if counts[g]:
                     metrics.append(ClinicalOutcomeMetrics(
-                        date=date,
+                        date=self.start_date + timedelta(days=day),
                         specialty=specialty,
-                        total_recommendations=total_recommendations,
-                        recommendations_followed=recommendations_followed,
-                        positive_outcomes=positive_outcomes,
-                        neutral_outcomes=neutral_outcomes,
-                        negative_outcomes=negative_outcomes,
-                        avg_confidence_score=avg_confidence,
-                        drug_interactions_prevented=interactions_prevented
+                        total_recommendations=counts[g],
+                        recommendations_followed=int(followed[g]),
+                        positive_outcomes=int(positive[g]),
+                        neutral_outcomes=int(neutral[g]),
+                        negative_outcomes=int(negative[g]),
+                        avg_confidence_score=confidence_sum[g] / counts[g] / CONFIDENCE_SCALE,
+                        # Drug interactions prevented (estimate): 30% had interactions
+                        drug_interactions_prevented=int(interactions[g] * 0.3)
                     ))
         
         return metrics
     
     def _calculate_specialty_usage(self) -> Dict[str, Any]:
         """Calculate usage statistics by medical specialty"""
+        df = self.query_logs_df
+        total_logs = len(df)
+        
+        # One grouped aggregation for the per-specialty figures; ratings of 0 mean no feedback
+        rated = self._log_masks["rated"]
+        summary = df.assign(rated=rated, rating=df["rating"].where(rated, 0)).groupby("specialty").agg(
+            total_queries=("confidence", "size"),
+            confidence_sum=("confidence", "sum"),
+            unique_users=("user", "nunique"),
+            rating_sum=("rating", "sum"),
+            rating_count=("rated", "sum")
+        )
+        
+        # Query types distribution, one row per specialty and one column per type
+        query_types = pd.crosstab(df["specialty"], df["query_type"]).reindex(
+            columns=range(len(QueryType)), fill_value=0
+        )
+        
         specialty_stats = {}
         
-        for specialty in Specialty:
-            specialty_queries = [log for log in self.query_logs if log.specialty == specialty]
-            
-            if specialty_queries:
-                total_queries = len(specialty_queries)
-                avg_confidence = sum(log.confidence_score for log in specialty_queries) / len(specialty_queries)
-                
-                # User distribution
-                unique_users = len(set(log.user_id for log in specialty_queries))
-                
-                # Query types distribution
-                query_types = {}
-                for query_type in QueryType:
-                    count = sum(1 for log in specialty_queries if log.query_type == query_type)
-                    query_types[query_type.value] = count
-                
-                # Feedback ratings
-                ratings = [log.user_feedback_rating for log in specialty_queries if log.user_feedback_rating]
-                avg_rating = sum(ratings) / len(ratings) if ratings else 0
-                
-                specialty_stats[specialty.value] = {
-                    "total_queries": total_queries,
-                    "unique_users": unique_users,
-                    "avg_confidence_score": round(avg_confidence, 3),
-                    "avg_user_rating": round(avg_rating, 2),
-                    "query_types": query_types,
-                    "usage_percentage": round(total_queries / len(self.query_logs) * 100, 1)
-                }
+        for specialty_num, row in zip(summary.index.tolist(), summary.itertuples(index=False)):
+            avg_confidence = row.confidence_sum / row.total_queries / CONFIDENCE_SCALE
+            avg_rating = row.rating_sum / row.rating_count if row.rating_count else 0
+            specialty_stats[_SPECIALTY_VALUES[specialty_num]] = {
+                "total_queries": int(row.total_queries),
+                "unique_users": int(row.unique_users),
+                "avg_confidence_score": round(float(avg_confidence), 3),
+                "avg_user_rating": round(float(avg_rating), 2),
+                "query_types": dict(zip(_QUERY_TYPE_VALUES, query_types.loc[specialty_num].tolist())),
+                "usage_percentage": round(int(row.total_queries) / total_logs * 100, 1)
+            }
         
         return specialty_stats
     
     def _calculate_quality_metrics(self) -> Dict[str, Any]:
         """Calculate overall system quality metrics"""
-        total_queries = len(self.query_logs)
+        columns = self._log_columns
+        masks = self._log_masks
+        confidence = columns["confidence"]
+        rating = columns["rating"]
+        total_queries = len(confidence)
         
         # Confidence score distribution
-        confidence_scores = [log.confidence_score for log in self.query_logs]
-        avg_confidence = sum(confidence_scores) / len(confidence_scores)
-        high_confidence_queries = sum(1 for score in confidence_scores if score >= 0.9)
+        avg_confidence = float(confidence.mean()) / CONFIDENCE_SCALE
+        high_confidence_queries = int(np.count_nonzero(columns["high_confidence"]))
         
-        # User satisfaction
-        ratings = [log.user_feedback_rating for log in self.query_logs if log.user_feedback_rating]
-        avg_rating = sum(ratings) / len(ratings) if ratings else 0
-        satisfied_users = sum(1 for rating in ratings if rating >= 4)
+        # User satisfaction (a rating of 0 means no feedback)
+        rating_count = int(np.count_nonzero(masks["rated"]))
+        avg_rating = int(rating.sum(dtype=np.int64)) / rating_count if rating_count else 0
+        satisfied_users = int(np.count_nonzero(rating >= 4))
         
         # Recommendation adoption
-        followed_recommendations = [log for log in self.query_logs if log.recommendation_followed is not None]
-        adoption_rate = (
-            sum(1 for log in followed_recommendations if log.recommendation_followed) / 
-            len(followed_recommendations) * 100
-        ) if followed_recommendations else 0
+        followed_recorded = columns["followed"][masks["followed"]]
+        adoption_rate = float(followed_recorded.mean()) * 100 if len(followed_recorded) else 0
         
         # Clinical outcomes
-        outcomes = [log.clinical_outcome for log in self.query_logs if log.clinical_outcome]
-        positive_outcomes = sum(1 for outcome in outcomes if outcome == "improved")
-        outcome_success_rate = (positive_outcomes / len(outcomes) * 100) if outcomes else 0
+        outcomes_recorded = int(np.count_nonzero(masks["outcome"]))
+        positive_outcomes = int(np.count_nonzero(columns["outcome"] == OUTCOME_VALUES.index("improved")))
+        outcome_success_rate = (positive_outcomes / outcomes_recorded * 100) if outcomes_recorded else 0
         
         # Performance metrics
-        avg_response_time = sum(log.processing_time_ms for log in self.query_logs) / len(self.query_logs)
+        avg_response_time = float(columns["processing_time"].mean())
+        
+        # Active users, against one 30-day cutoff
+        cutoff = datetime.now() - timedelta(days=30)
         
         return {
             "total_queries": total_queries,
             "avg_confidence_score": round(avg_confidence, 3),
             "high_confidence_percentage": round(high_confidence_queries / total_queries * 100, 1),
             "avg_user_rating": round(avg_rating, 2),
-            "user_satisfaction_percentage": round(satisfied_users / len(ratings) * 100, 1) if ratings else 0,
+            "user_satisfaction_percentage": round(satisfied_users / rating_count * 100, 1) if rating_count else 0,
             "recommendation_adoption_rate": round(adoption_rate, 1),
             "clinical_outcome_success_rate": round(outcome_success_rate, 1),
             "avg_response_time_ms": round(avg_response_time, 1),
             "total_users": len(self.user_metrics),
-            "active_users_last_30_days": len([
-                user for user in self.user_metrics 
-                if user.last_active >= datetime.now() - timedelta(days=30)
-            ])
+            "active_users_last_30_days": sum(1 for user in self.user_metrics if user.last_active >= cutoff)
         }
     
     def get_usage_trends(self, days: int = 30) -> Dict[str, Any]:
         """Get usage trends over specified time period"""
         cutoff_date = self.end_date - timedelta(days=days)
-        recent_queries = [log for log in self.query_logs if log.timestamp >= cutoff_date]
-        
-        # Daily usage
-        daily_usage = {}
-        for log in recent_queries:
-            date_str = log.timestamp.strftime('%Y-%m-%d')
-            daily_usage[date_str] = daily_usage.get(date_str, 0) + 1
-        
-        # Hourly usage patterns
-        hourly_usage = {}
-        for log in recent_queries:
-            hour = log.timestamp.hour
-            hourly_usage[hour] = hourly_usage.get(hour, 0) + 1
-        
-        # User role distribution
-        role_usage = {}
-        for log in recent_queries:
-            role = log.user_role.value
-            role_usage[role] = role_usage.get(role, 0) + 1
+        
+        # Logs are in time order, so the window starts at a binary-searched position
+        timestamps = self._log_columns["timestamp"]
+        start = int(np.searchsorted(timestamps, np.datetime64(cutoff_date, "us")))
+        recent_queries = self.query_logs[start:]
+        
+        # Daily usage over calendar-day values, formatting only the distinct days
+        dates, day_counts = np.unique(timestamps[start:].astype("datetime64[D]"), return_counts=True)
+        daily_usage = dict(zip(np.datetime_as_string(dates).tolist(), day_counts.tolist()))
+        
+        # Hourly patterns, counted in C
+        hourly_usage = dict(Counter(log.timestamp.hour for log in recent_queries))
+        
+        # User role distribution straight from the role index column
+        role_counts = np.bincount(self._log_columns["role"][start:], minlength=len(_ROLE_VALUES))
+        role_usage = {_ROLE_VALUES[i]: count for i, count in enumerate(role_counts.tolist()) if count}
         
         return {
             "period_days": days,
@@ -500,14 +654,15 @@ class AnalyticsDatabase:
     
     def get_performance_dashboard(self) -> Dict[str, Any]:
         """Get comprehensive performance dashboard data"""
-        recent_performance = self.performance_metrics[-30:]  # Last 30 days
+        daily = self._daily_performance
+        recent = slice(-30, None)  # Last 30 days
         
         return {
             "system_health": {
-                "avg_uptime": sum(p.system_uptime_percentage for p in recent_performance) / len(recent_performance),
-                "avg_error_rate": sum(p.error_rate_percentage for p in recent_performance) / len(recent_performance),
-                "avg_response_time": sum(p.avg_response_time_ms for p in recent_performance) / len(recent_performance),
-                "peak_concurrent_users": max(p.peak_concurrent_users for p in recent_performance)
+                "avg_uptime": float(daily["uptime"][recent].mean()),
+                "avg_error_rate": float(daily["error_rate"][recent].mean()),
+                "avg_response_time": float(daily["response_time"][recent].mean()),
+                "peak_concurrent_users": int(daily["peak_users"][recent].max())
             },
             "quality_metrics": self.quality_metrics,
             "usage_trends": self.get_usage_trends(30),
@@ -522,10 +677,13 @@ def get_analytics_summary() -> Dict[str, Any]:
     """Get high-level analytics summary"""
     return analytics_db.quality_metrics
 
+# The mock data never changes after generation, so computed views are reused across requests
+@lru_cache(maxsize=128)
 def get_usage_trends(days: int = 30) -> Dict[str, Any]:
     """Get usage trends"""
     return analytics_db.get_usage_trends(days)
 
+@lru_cache(maxsize=1)
 def get_performance_dashboard() -> Dict[str, Any]:
     """Get performance dashboard data"""
     return analytics_db.get_performance_dashboard()
@@ -538,17 +696,19 @@ def get_user_engagement_metrics() -> Dict[str, Any]:
     """Get user engagement and training metrics"""
     users = analytics_db.user_metrics
     
-    # Calculate engagement metrics
+    # Calculate engagement metrics against one 30-day cutoff
+    cutoff = datetime.now() - timedelta(days=30)
+    active = [u for u in users if u.last_active >= cutoff]
     total_users = len(users)
-    active_users = len([u for u in users if u.last_active >= datetime.now() - timedelta(days=30)])
-    certified_users = len([u for u in users if u.certification_status == "certified"])
-    avg_training_completion = sum(u.training_completion_rate for u in users) / total_users
+    active_users = len(active)
+    certified_users = sum(1 for u in users if u.certification_status == "certified")
+    avg_training_completion = fmean(u.training_completion_rate for u in users)
     
     # Role distribution
-    role_distribution = {}
-    for user in users:
-        role = user.user_role.value
-        role_distribution[role] = role_distribution.get(role, 0) + 1
+    role_counts = Counter(user.user_role for user in users)
+    role_distribution = {
+        _ROLE_VALUES[i]: role_counts[role] for i, role in enumerate(UserRole) if role_counts[role]
+    }
     
     return {
         "total_users": total_users,
@@ -558,10 +718,7 @@ def get_user_engagement_metrics() -> Dict[str, Any]:
         "certification_rate": round(certified_users / total_users * 100, 1),
         "avg_training_completion": round(avg_training_completion * 100, 1),
         "role_distribution": role_distribution,
-        "avg_queries_per_active_user": round(
-            sum(u.total_queries for u in users if u.last_active >= datetime.now() - timedelta(days=30)) / 
-            max(active_users, 1), 1
-        )
+        "avg_queries_per_active_user": round(fmean(u.total_queries for u in active), 1) if active else 0
     }
 
 # Example usage and testing
@@ -32,7 +32,7 @@ async def main():
     print(f"Expanding knowledge for specialties: {', '.join(specialties)}")
     
     # Load expanded knowledge
-    success = processor.load_expanded_medical_knowledge(specialties)
+    success = await processor.load_expanded_medical_knowledge(specialties)
     
     if success:
         print("✅ Knowledge base expansion completed successfully!")